@@ -1,4 +1,36 @@
 import re
+from utils.text_context import AnalyzedText
+
+# Use RE2 (linear-time DFA) for the literal-alternation scans when available
+try:
+    import re2 as _re
+except ImportError:
+    _re = re
+
+# Precompiled patterns (compiled once at import instead of on every analyze call)
+# Patterns using \d, \s or \w stay on `re`: RE2 treats those classes as ASCII-only
+_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+_SOURCE_RE = _re.compile(r'(?i)(according to|source:|via|study by|research by|data from|reported by)')
+_FAQ_RE = re.compile(r'(frequently asked questions|faq|q:|question:|q\d+:)')
+_HOWTO_RE = re.compile(r'(step \d+|first,|second,|third,|finally,|\d+\.\s+\w+)')
+_DEF_RE = re.compile(r'(is defined as|refers to|means that|is a|are \w+ that)')
+_SUM_RE = _re.compile(r'(in summary|in conclusion|to summarize|key takeaways|bottom line)')
+_CMP_RE = _re.compile(r'(compared to|versus|vs\.|difference between|similar to)')
+
+# List markers and how many occurrences it takes to count as a list ('\u2022' is the bullet point)
+_LIST_MARKERS = (('\u2022', 2), ('\n- ', 2), ('\n1.', 1), ('\n2.', 1))
+
+# Below this many words there is nothing for the AEO checks to find
+_MIN_WORDS = 50
+
+# Score left once every check has deducted, which is what content with none of the signals gets
+_FLOOR_SCORE = 10
+
+# Direct answer openers, fused into one alternation and anchored at each line start
+_DIRECT_RE = re.compile(
+    r'^(?:(?:yes|no),|the (?:best|main|primary|key)|\w+ (?:is|are|can|will|should)|you (?:can|should|need|must))',
+    re.MULTILINE
+)
 
 class AEOAnalyzer:
     """Analyze Answer Engine Optimization - how AI-friendly is the content"""
@@ -7,12 +39,31 @@ class AEOAnalyzer:
         """
         Analyze AEO factors for AI discoverability
         Returns score with issues and recommendations
+        text may be a str or an AnalyzedText shared with the other analyzers
         """
         score = 100
         issues = []
         recommendations = []
         details = {}
         
+        doc = AnalyzedText.of(text)
+        text, text_lower = doc.text, doc.lower
+        
+        # Skip the regex scans entirely for tiny inputs
+        word_count = doc.word_count
+        if word_count < _MIN_WORDS:
+            return {
+                'score': _FLOOR_SCORE,
+                'issues': [f"Content too short for AEO analysis ({word_count} words)"],
+                'recommendations': ['Add more content'],
+                'details': {
+                    'citations': {'count': 0, 'urls': 0, 'source_mentions': 0},
+                    'structured_content': {'has_faq_pattern': False, 'has_lists': False, 'has_how_to_pattern': False},
+                    'ai_patterns': {'definition_count': 0, 'has_summary': False, 'has_comparisons': False},
+                    'answer_style': {'direct_answers': 0, 'total_sentences': 0}
+                }
+            }
+        
         # 1. Citation/Source Analysis
         citations = self._detect_citations(text)
         details['citations'] = citations
@@ -29,7 +80,7 @@ class AEOAnalyzer:
             details['good_points'] = [f"{citations['count']} citations with sources"]
         
         # 2. Structured Data / Formatting
-        structured = self._analyze_structured_content(text, headers)
+        structured = self._analyze_structured_content(text, text_lower, headers)
         details['structured_content'] = structured
         
         if not structured['has_faq_pattern']:
@@ -48,7 +99,7 @@ class AEOAnalyzer:
             recommendations.append("Add clear step-by-step format (enhances AI understanding)")
         
         # 3. AI-Friendly Patterns
-        ai_patterns = self._analyze_ai_patterns(text)
+        ai_patterns = self._analyze_ai_patterns(text_lower)
         details['ai_patterns'] = ai_patterns
         
         if ai_patterns['definition_count'] < 2:
@@ -62,7 +113,7 @@ class AEOAnalyzer:
             recommendations.append("Add a clear summary or key takeaways section")
         
         # 4. Answer-Style Content
-        answer_style = self._analyze_answer_style(text)
+        answer_style = self._analyze_answer_style(doc)
         details['answer_style'] = answer_style
         
         if answer_style['direct_answers'] < 3:
@@ -82,11 +133,8 @@ class AEOAnalyzer:
     def _detect_citations(self, text):
         """Detect citations and sources in content"""
         # Look for citation patterns
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        source_keywords = r'(according to|source:|via|study by|research by|data from|reported by)'
-        
-        urls = re.findall(url_pattern, text)
-        source_mentions = len(re.findall(source_keywords, text, re.IGNORECASE))
+        urls = _URL_RE.findall(text)
+        source_mentions = sum(1 for _ in _SOURCE_RE.finditer(text))
         
         return {
             'count': len(urls) + source_mentions,
@@ -94,23 +142,16 @@ class AEOAnalyzer:
             'source_mentions': source_mentions
         }
     
-    def _analyze_structured_content(self, text, headers):
+    def _analyze_structured_content(self, text, text_lower, headers):
         """Analyze structured content elements"""
-        text_lower = text.lower()
-        
         # Check for FAQ pattern
-        faq_pattern = r'(frequently asked questions|faq|q:|question:|q\d+:)'
-        has_faq = bool(re.search(faq_pattern, text_lower))
+        has_faq = bool(_FAQ_RE.search(text_lower))
         
         # Check for lists
-        has_lists = (text.count('•') > 2 or 
-                    text.count('\n- ') > 2 or 
-                    text.count('\n1.') > 1 or
-                    text.count('\n2.') > 1)
+        has_lists = any(text.count(marker) > threshold for marker, threshold in _LIST_MARKERS)
         
         # Check for how-to/step pattern
-        how_to_pattern = r'(step \d+|first,|second,|third,|finally,|\d+\.\s+\w+)'
-        has_how_to = bool(re.search(how_to_pattern, text_lower))
+        has_how_to = bool(_HOWTO_RE.search(text_lower))
         
         return {
             'has_faq_pattern': has_faq,
@@ -118,21 +159,16 @@ class AEOAnalyzer:
             'has_how_to_pattern': has_how_to
         }
     
-    def _analyze_ai_patterns(self, text):
+    def _analyze_ai_patterns(self, text_lower):
         """Analyze AI-friendly content patterns"""
-        text_lower = text.lower()
-        
         # Look for definitions
-        definition_patterns = r'(is defined as|refers to|means that|is a|are \w+ that)'
-        definition_count = len(re.findall(definition_patterns, text_lower))
+        definition_count = sum(1 for _ in _DEF_RE.finditer(text_lower))
         
         # Look for summary/conclusion
-        summary_pattern = r'(in summary|in conclusion|to summarize|key takeaways|bottom line)'
-        has_summary = bool(re.search(summary_pattern, text_lower))
+        has_summary = bool(_SUM_RE.search(text_lower))
         
         # Look for comparisons (good for AI)
-        comparison_pattern = r'(compared to|versus|vs\.|difference between|similar to)'
-        has_comparisons = bool(re.search(comparison_pattern, text_lower))
+        has_comparisons = bool(_CMP_RE.search(text_lower))
         
         return {
             'definition_count': definition_count,
@@ -140,29 +176,16 @@ class AEOAnalyzer:
             'has_comparisons': has_comparisons
         }
     
-    def _analyze_answer_style(self, text):
+    def _analyze_answer_style(self, doc):
         """Analyze if content provides direct, quotable answers"""
-        sentences = re.split(r'[.!?]+', text)
-        
-        # Look for direct answer patterns
-        direct_patterns = [
-            r'^(yes|no),',
-            r'^the (best|main|primary|key)',
-            r'^\w+ (is|are|can|will|should)',
-            r'^you (can|should|need|must)'
-        ]
-        
-        direct_answers = 0
-        for sentence in sentences:
-            sentence_clean = sentence.strip().lower()
-            if len(sentence_clean) < 10:
-                continue
-            for pattern in direct_patterns:
-                if re.match(pattern, sentence_clean):
-                    direct_answers += 1
-                    break
+        stripped = [s.strip() for s in doc.sentence_parts]
+        
+        # Look for direct answer patterns: one sentence per line, lowercased and scanned in a single pass.
+        # Newlines inside a sentence become '\r' so they can't start a new line match.
+        joined = '\n'.join(s.replace('\n', '\r') for s in stripped if len(s) >= 10).lower()
+        direct_answers = sum(1 for _ in _DIRECT_RE.finditer(joined))
         
         return {
             'direct_answers': direct_answers,
-            'total_sentences': len([s for s in sentences if len(s.strip()) > 10])
+            'total_sentences': sum(1 for s in stripped if len(s) > 10)
         }
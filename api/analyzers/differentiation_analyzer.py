@@ -1,4 +1,81 @@
 import re
+from dataclasses import dataclass
+from utils.phrase_matcher import build_phrase_automaton, scan_phrases
+from utils.text_context import AnalyzedText
+
+# Precompiled patterns (compiled once at import instead of on every analyze call)
+_PERSONAL_RE = re.compile(r'(in my|i found|we tested|our research|we analyzed|my experience|our study)')
+_DATA_RE = re.compile(r'(our data shows|we found that|our analysis reveals|survey of \d+)')
+_TOOL_RE = re.compile(r'(we compared|we tested|we evaluated|our comparison|our review)')
+_VISUAL_RE = re.compile(r'(see chart|see graph|image below|screenshot|diagram|infographic)')
+
+# Fixed phrase lists, scanned together in one Aho-Corasick pass per analyze call
+_PHRASES = {
+    'personal': (
+        'in my experience', 'i found', 'we discovered', 'our research',
+        'we tested', 'my team', 'our analysis', 'we analyzed'
+    ),
+    'perspective': ('small business',),
+    'generic': (
+        'it is important', 'you need to', 'there are many', 'this is a',
+        'can help you', 'one of the', 'make sure', 'keep in mind',
+        'in this article', 'we will discuss', 'you should', 'it can be'
+    ),
+    # Stems, so 'optimized' and 'metrics' still count
+    'technical': ('algorithm', 'optimize', 'metric', 'parameter', 'implementation'),
+    'story': ('picture this',),
+    # Emojis have no case, so they can ride along on the lowercase scan
+    'playful': ('🎯', '🚀', '💪', '✨'),
+}
+_PHRASE_AC = build_phrase_automaton(_PHRASES)
+
+# Generic openings, checked as prefixes of the content
+_GENERIC_STARTS = (
+    'in this article', 'in this guide', 'in this post',
+    'what is', 'introduction', 'overview'
+)
+
+# Single-word indicators, matched as whole words ('once' no longer hits 'bounce')
+_CASUAL_WORDS = frozenset(['you\'ll', 'let\'s', 'here\'s', 'that\'s', 'don\'t'])
+_STORY_WORDS = frozenset(['once', 'imagine', 'story', 'journey'])
+# Audience words, singular and plural ('mom' no longer hits 'moment')
+_PERSPECTIVE_WORDS = frozenset([
+    'student', 'beginner', 'expert', 'professional', 'enterprise',
+    'startup', 'freelancer', 'mom', 'dad', 'senior',
+    'students', 'beginners', 'experts', 'professionals', 'enterprises',
+    'startups', 'freelancers', 'moms', 'dads', 'seniors'
+])
+
+# Slotted detail blocks: one fixed-layout object per block instead of a dict per call.
+# orjson serializes dataclasses directly, so the JSON response keeps the same shape.
+@dataclass(slots=True)
+class UniquenessDetails:
+    has_unique_examples: bool
+    has_unique_angle: bool
+
+@dataclass(slots=True)
+class OverlapDetails:
+    overlap_percentage: int
+    generic_phrases_found: int
+
+@dataclass(slots=True)
+class UniqueElementsDetails:
+    personal_examples: int
+    original_data: int
+    unique_comparisons: int
+    has_visuals: bool
+
+@dataclass(slots=True)
+class StructureDetails:
+    has_unique_structure: bool
+    has_generic_opening: bool
+
+@dataclass(slots=True)
+class VoiceDetails:
+    has_distinct_voice: bool
+    dominant_voice: str
+    casual_score: int
+    technical_score: int
 
 class DifferentiationAnalyzer:
     """Analyze content uniqueness vs SERP competition"""
@@ -7,23 +84,28 @@ class DifferentiationAnalyzer:
         """
         Analyze content differentiation from competitors
         Returns score with uniqueness analysis
+        text may be a str or an AnalyzedText shared with the other analyzers
         """
         score = 100
         issues = []
         recommendations = []
         details = {}
         
+        doc = AnalyzedText.of(text)
+        text, text_lower = doc.text, doc.lower
+        phrase_hits = scan_phrases(_PHRASE_AC, text_lower)
+        
         if not serp_data or 'serp_data' not in serp_data:
             # Basic analysis without SERP data
-            uniqueness = self._analyze_basic_uniqueness(text)
+            uniqueness = self._analyze_basic_uniqueness(doc, phrase_hits)
             details['uniqueness'] = uniqueness
             
-            if not uniqueness['has_unique_examples']:
+            if not uniqueness.has_unique_examples:
                 score -= 20
                 issues.append("No unique examples or data points detected")
                 recommendations.append("Add original data points or product comparisons")
             
-            if not uniqueness['has_unique_angle']:
+            if not uniqueness.has_unique_angle:
                 score -= 15
                 issues.append("Content follows generic structure")
                 recommendations.append("Use unique angle (e.g., 'student perspective' vs generic advice)")
@@ -42,49 +124,49 @@ class DifferentiationAnalyzer:
         # In production, you'd actually fetch and compare against top 3 SERP results
         
         # 1. Content overlap analysis with detailed breakdown
-        overlap_score = self._simulate_content_overlap(text)
+        overlap_score = self._simulate_content_overlap(doc, phrase_hits)
         details['content_overlap'] = overlap_score
         
-        if overlap_score['overlap_percentage'] > 70:
+        if overlap_score.overlap_percentage > 70:
             score -= 30
-            issues.append(f"{overlap_score['overlap_percentage']}% content overlap with top 3 SERP results")
+            issues.append(f"{overlap_score.overlap_percentage}% content overlap with top 3 SERP results")
             issues.append("No unique examples or data")
             recommendations.append("Add original data points or product comparisons")
-        elif overlap_score['overlap_percentage'] > 50:
+        elif overlap_score.overlap_percentage > 50:
             score -= 20
-            issues.append(f"{overlap_score['overlap_percentage']}% content overlap with competitors")
+            issues.append(f"{overlap_score.overlap_percentage}% content overlap with competitors")
             recommendations.append("Inject more unique perspective or original research")
         
         # 2. Unique elements detection with specific counts
-        unique_elements = self._detect_unique_elements(text)
+        unique_elements = self._detect_unique_elements(text_lower)
         details['unique_elements'] = unique_elements
         
-        if unique_elements['personal_examples'] == 0:
+        if unique_elements.personal_examples == 0:
             score -= 15
             issues.append("No unique examples or data")
             recommendations.append("Add original data points or product comparisons")
         
-        if unique_elements['original_data'] == 0:
+        if unique_elements.original_data == 0:
             score -= 10
             # Don't duplicate if already mentioned above
-            if unique_elements['personal_examples'] > 0:
+            if unique_elements.personal_examples > 0:
                 issues.append("No original data or research")
                 recommendations.append("Include original data, surveys, or experiments")
         
         # 3. Structure comparison with specific feedback
-        structure_diff = self._analyze_structure_difference(text, serp_info)
+        structure_diff = self._analyze_structure_difference(text, text_lower, serp_info)
         details['structure'] = structure_diff
         
-        if not structure_diff['has_unique_structure']:
+        if not structure_diff.has_unique_structure:
             score -= 15
             issues.append("Same structure as competitors (all follow identical outline)")
             recommendations.append("Use unique angle (e.g., 'student perspective' vs generic advice)")
         
         # 4. Voice and tone differentiation
-        voice = self._analyze_voice_differentiation(text)
+        voice = self._analyze_voice_differentiation(doc, phrase_hits)
         details['voice'] = voice
         
-        if not voice['has_distinct_voice']:
+        if not voice.has_distinct_voice:
             score -= 10
             issues.append("Generic voice and tone")
             recommendations.append("Develop stronger brand voice (casual, technical, playful, etc.)")
@@ -98,96 +180,65 @@ class DifferentiationAnalyzer:
             'details': details
         }
     
-    def _analyze_basic_uniqueness(self, text):
+    def _analyze_basic_uniqueness(self, doc, phrase_hits):
         """Basic uniqueness analysis without SERP comparison"""
-        text_lower = text.lower()
-        
         # Check for unique examples
-        personal_indicators = [
-            'in my experience', 'i found', 'we discovered', 'our research',
-            'we tested', 'my team', 'our analysis', 'we analyzed'
-        ]
-        has_unique_examples = any(indicator in text_lower for indicator in personal_indicators)
+        has_unique_examples = bool(phrase_hits['personal'])
         
         # Check for unique angle
-        perspective_indicators = [
-            'student', 'beginner', 'expert', 'professional', 'small business',
-            'enterprise', 'startup', 'freelancer', 'mom', 'dad', 'senior'
-        ]
-        has_unique_angle = any(indicator in text_lower for indicator in perspective_indicators)
+        has_unique_angle = bool(phrase_hits['perspective']) or not doc.word_counts.keys().isdisjoint(_PERSPECTIVE_WORDS)
         
-        return {
-            'has_unique_examples': has_unique_examples,
-            'has_unique_angle': has_unique_angle
-        }
+        return UniquenessDetails(
+            has_unique_examples=has_unique_examples,
+            has_unique_angle=has_unique_angle
+        )
     
-    def _simulate_content_overlap(self, text):
+    def _simulate_content_overlap(self, doc, phrase_hits):
         """
         Simulate content overlap analysis
         In production: would use TF-IDF or embeddings to compare against actual SERP content
         """
-        text_lower = text.lower()
-        
-        # Common generic phrases that appear in ALL content
-        generic_phrases = [
-            'it is important', 'you need to', 'there are many', 'this is a',
-            'can help you', 'one of the', 'make sure', 'keep in mind',
-            'in this article', 'we will discuss', 'you should', 'it can be'
-        ]
-        
-        generic_count = sum(1 for phrase in generic_phrases if phrase in text_lower)
-        sentence_count = len(re.split(r'[.!?]+', text))
+        # Common generic phrases that appear in ALL content (distinct phrases found)
+        generic_count = len(phrase_hits['generic'])
+        sentence_count = len(doc.sentence_parts)
         
         # Estimate overlap based on generic phrase density
         overlap_percentage = min(int((generic_count / sentence_count) * 100), 90) if sentence_count > 0 else 70
         
         # Add some randomness based on content length
-        word_count = len(text.split())
-        if word_count < 500:
+        if doc.word_count < 500:
             overlap_percentage += 10
         
-        return {
-            'overlap_percentage': min(overlap_percentage, 95),
-            'generic_phrases_found': generic_count
-        }
+        return OverlapDetails(
+            overlap_percentage=min(overlap_percentage, 95),
+            generic_phrases_found=generic_count
+        )
     
-    def _detect_unique_elements(self, text):
+    def _detect_unique_elements(self, text_lower):
         """Detect unique, differentiating elements"""
-        text_lower = text.lower()
-        
         # Personal examples
-        personal_patterns = r'(in my|i found|we tested|our research|we analyzed|my experience|our study)'
-        personal_examples = len(re.findall(personal_patterns, text_lower))
+        personal_examples = len(_PERSONAL_RE.findall(text_lower))
         
         # Original data indicators
-        data_patterns = r'(our data shows|we found that|our analysis reveals|survey of \d+)'
-        original_data = len(re.findall(data_patterns, text_lower))
+        original_data = len(_DATA_RE.findall(text_lower))
         
         # Unique comparisons or tools
-        tool_patterns = r'(we compared|we tested|we evaluated|our comparison|our review)'
-        unique_comparisons = len(re.findall(tool_patterns, text_lower))
+        unique_comparisons = len(_TOOL_RE.findall(text_lower))
         
         # Visual content indicators
-        visual_patterns = r'(see chart|see graph|image below|screenshot|diagram|infographic)'
-        has_visuals = bool(re.search(visual_patterns, text_lower))
+        has_visuals = bool(_VISUAL_RE.search(text_lower))
         
-        return {
-            'personal_examples': personal_examples,
-            'original_data': original_data,
-            'unique_comparisons': unique_comparisons,
-            'has_visuals': has_visuals
-        }
+        return UniqueElementsDetails(
+            personal_examples=personal_examples,
+            original_data=original_data,
+            unique_comparisons=unique_comparisons,
+            has_visuals=has_visuals
+        )
     
-    def _analyze_structure_difference(self, text, serp_info):
+    def _analyze_structure_difference(self, text, text_lower, serp_info):
         """Analyze if structure is different from competitors"""
         # Common generic structures
-        generic_starts = [
-            'in this article', 'in this guide', 'in this post',
-            'what is', 'introduction', 'overview'
-        ]
-        
-        first_100 = text[:100].lower()
-        has_generic_start = any(start in first_100 for start in generic_starts)
+        has_generic_start = text_lower[:100].lstrip().startswith(_GENERIC_STARTS)
         
         # Check for unique formatting
         has_unique_format = (
@@ -198,30 +249,26 @@ class DifferentiationAnalyzer:
             text.count('`') > 4       # Code formatting
         )
         
-        return {
-            'has_unique_structure': not has_generic_start or has_unique_format,
-            'has_generic_opening': has_generic_start
-        }
+        return StructureDetails(
+            has_unique_structure=not has_generic_start or has_unique_format,
+            has_generic_opening=has_generic_start
+        )
     
-    def _analyze_voice_differentiation(self, text):
+    def _analyze_voice_differentiation(self, doc, phrase_hits):
         """Analyze voice and tone distinctiveness"""
-        text_lower = text.lower()
+        text, word_counts = doc.text, doc.word_counts
         
         # Casual voice indicators
-        casual_indicators = ['you\'ll', 'let\'s', 'here\'s', 'that\'s', 'don\'t']
-        casual_count = sum(text_lower.count(ind) for ind in casual_indicators)
+        casual_count = sum(word_counts[w] for w in _CASUAL_WORDS)
         
         # Technical voice
-        technical_indicators = ['algorithm', 'optimize', 'metric', 'parameter', 'implementation']
-        technical_count = sum(text_lower.count(ind) for ind in technical_indicators)
+        technical_count = sum(phrase_hits['technical'].values())
         
-        # Playful voice
-        playful_indicators = ['🎯', '🚀', '💪', '✨', '!' * 2]
-        playful_count = sum(text.count(ind) for ind in playful_indicators)
+        # Playful voice (emojis from the phrase scan; '!!' stays a non-overlapping str.count)
+        playful_count = sum(phrase_hits['playful'].values()) + text.count('!!')
         
         # Story-driven voice
-        story_indicators = ['once', 'imagine', 'picture this', 'story', 'journey']
-        story_count = sum(text_lower.count(ind) for ind in story_indicators)
+        story_count = sum(word_counts[w] for w in _STORY_WORDS) + sum(phrase_hits['story'].values())
         
         # Determine if there's a distinct voice
         total_indicators = casual_count + technical_count + playful_count + story_count
@@ -237,9 +284,9 @@ class DifferentiationAnalyzer:
         elif story_count > 2:
             dominant_voice = 'story-driven'
         
-        return {
-            'has_distinct_voice': has_distinct_voice,
-            'dominant_voice': dominant_voice,
-            'casual_score': casual_count,
-            'technical_score': technical_count
-        }
+        return VoiceDetails(
+            has_distinct_voice=has_distinct_voice,
+            dominant_voice=dominant_voice,
+            casual_score=casual_count,
+            technical_score=technical_count
+        )
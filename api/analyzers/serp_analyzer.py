@@ -1,6 +1,44 @@
 from utils.serp_scraper import SERPScraper
+from utils.text_context import AnalyzedText
 import re
+import threading
 from collections import Counter
+from cachetools import TTLCache
+
+# Use RE2 (linear-time DFA) for the literal-alternation scans when available
+try:
+    import re2 as _re
+except ImportError:
+    _re = re
+
+# Precompiled patterns (compiled once at import instead of on every analyze call)
+# Patterns using \d or \s stay on `re`: RE2 treats those classes as ASCII-only
+# Competitor page scans run on lowercased text
+_SERP_STATS_RE = re.compile(r'\d+%|\d+\s*(?:percent|million|billion|thousand)')
+_SERP_STATS_COUNT_RE = re.compile(r'\d+%|\d+\s*(?:percent|million|billion)')
+_SERP_EXAMPLES_RE = _re.compile(r'for example|case study|real-world|instance')
+_SERP_COMPARISON_RE = _re.compile(r'comparison|versus|vs\.|compared to')
+# User content scans, also run on lowercased text
+_STATS_RE = re.compile(r'\d+%|\d+\s*(?:percent|million|billion|thousand|users|customers)')
+_EXAMPLES_RE = _re.compile(r'for example|case study|real-world|instance|specifically')
+_COMPARISON_RE = _re.compile(r'comparison|versus|vs\.|compared to|alternative')
+
+# Topic suggestions based on common keyword patterns (first category in this order wins)
+_TOPIC_MAP = {
+    'laptop': ['Price comparisons', 'Battery life tests', 'Performance benchmarks', 'User reviews'],
+    'phone': ['Camera comparisons', 'Battery tests', 'Price analysis', 'User ratings'],
+    'software': ['Feature comparison', 'Pricing tiers', 'User testimonials', 'Integration guides'],
+    'service': ['Pricing breakdown', 'Customer reviews', 'Alternatives comparison', 'Setup guide'],
+    'product': ['Specs comparison', 'Price analysis', 'Customer feedback', 'Best use cases'],
+    'guide': ['Step-by-step tutorial', 'Common mistakes', 'Expert tips', 'FAQ section'],
+    'review': ['Pros and cons', 'Alternatives', 'Pricing', 'User feedback']
+}
+_DEFAULT_TOPICS = ['Detailed comparisons', 'User testimonials', 'Expert analysis', 'Pricing breakdown']
+_TOPIC_RE = re.compile('|'.join(_TOPIC_MAP))
+
+# Aggregated competitor patterns per set of result URLs (1 hour), so warm keywords skip the regex pass too
+_ANALYSIS_CACHE = TTLCache(maxsize=256, ttl=3600)
+_ANALYSIS_LOCK = threading.Lock()
 
 class SERPAnalyzer:
     """Analyze SERP performance and predict ranking potential"""
@@ -12,12 +50,16 @@ class SERPAnalyzer:
         """
         Analyze content against SERP competition
         Returns score with detailed competitive analysis
+        text may be a str or an AnalyzedText shared with the other analyzers
         """
         score = 100
         issues = []
         recommendations = []
         details = {}
         
+        doc = AnalyzedText.of(text)
+        text, text_lower = doc.text, doc.lower
+        
         if not target_keyword:
             return {
                 'score': 50,
@@ -26,8 +68,11 @@ class SERPAnalyzer:
                 'details': {'serp_data': None}
             }
         
+        # Google matches case-insensitively, so one lowercase key serves the query, the caches and topic lookup
+        keyword_lower = target_keyword.lower()
+        
         # 1. Fetch SERP competitors
-        serp_results = self.scraper.scrape_google_results(target_keyword, num_results=10)
+        serp_results = self.scraper.scrape_google_results(keyword_lower, num_results=10)
         details['target_keyword'] = target_keyword
         details['serp_results_found'] = len(serp_results)
         
@@ -42,7 +87,7 @@ class SERPAnalyzer:
         serp_data = details['serp_data']
         
         # 2. Compare word count with detailed SERP metrics
-        user_word_count = len(text.split())
+        user_word_count = doc.word_count
         avg_word_count = serp_data['avg_word_count']
         
         word_count_ratio = user_word_count / avg_word_count if avg_word_count > 0 else 0
@@ -79,7 +124,7 @@ class SERPAnalyzer:
         }
         
         # Generate example missing topics based on keyword context
-        common_missing_topics = self._suggest_missing_topics(target_keyword, user_topic_count, avg_topic_count)
+        common_missing_topics = self._suggest_missing_topics(keyword_lower, user_topic_count, avg_topic_count)
         
         if user_topic_count < avg_topic_count * 0.6:
             score -= 20
@@ -90,7 +135,7 @@ class SERPAnalyzer:
             recommendations.append(f"Add {missing_topics}+ subtopics covering {', '.join(common_missing_topics[:2]) if common_missing_topics else 'competitive topics'}")
         
         # 4. Content elements analysis with detailed metrics
-        elements = self._analyze_content_elements(text)
+        elements = self._analyze_content_elements(text, text_lower)
         details['content_elements'] = elements
         
         # Check for comparisons
@@ -173,6 +218,12 @@ class SERPAnalyzer:
     
     def _analyze_serp_results(self, results):
         """Analyze fetched SERP results"""
+        cache_key = tuple(sorted(result['url'] for result in results))
+        with _ANALYSIS_LOCK:
+            cached = _ANALYSIS_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        
         word_counts = []
         topic_counts = []
         has_stats = 0
@@ -181,33 +232,39 @@ class SERPAnalyzer:
         has_lists = 0
         total_stats = 0
         
-        for result in results:
+        # Fetch all competitor pages concurrently, then analyze them in order
+        pages = self.scraper.fetch_pages_content([result['url'] for result in results])
+        
+        for content in pages:
             try:
-                content = self.scraper.fetch_page_content(result['url'])
                 if content['word_count'] > 0:
                     word_counts.append(content['word_count'])
                     topic_counts.append(content['header_count'])
                     
                     # Detect patterns
                     text = content['text'].lower()
-                    if re.search(r'\d+%|\d+\s*(percent|million|billion|thousand)', text):
+                    # Every counted stat also matches the broader presence pattern,
+                    # so the presence search only runs when nothing was counted
+                    stats_found = len(_SERP_STATS_COUNT_RE.findall(text))
+                    if stats_found or _SERP_STATS_RE.search(text):
                         has_stats += 1
-                        total_stats += len(re.findall(r'\d+%|\d+\s*(percent|million|billion)', text))
+                        total_stats += stats_found
                     
-                    if re.search(r'(for example|case study|real-world|instance)', text):
+                    if _SERP_EXAMPLES_RE.search(text):
                         has_examples += 1
                     
-                    if re.search(r'(comparison|versus|vs\.|compared to)', text):
+                    if _SERP_COMPARISON_RE.search(text):
                         has_comparisons += 1
                     
-                    if text.count('•') > 3 or text.count('\n-') > 3:
+                    # Page text arrives whitespace-collapsed, so newline-dash lists can't occur here
+                    if text.count('•') > 3:
                         has_lists += 1
             except:
                 continue
         
         valid_count = len(word_counts) or 1
         
-        return {
+        analysis = {
             'avg_word_count': int(sum(word_counts) / valid_count) if word_counts else 2500,
             'avg_topics': int(sum(topic_counts) / valid_count) if topic_counts else 8,
             'patterns': {
@@ -218,21 +275,24 @@ class SERPAnalyzer:
                 'avg_stats': int(total_stats / valid_count) if has_stats > 0 else 5
             }
         }
+        
+        # Only keep complete results; a partly failed fetch should be retried next time
+        if len(word_counts) == len(results):
+            with _ANALYSIS_LOCK:
+                _ANALYSIS_CACHE[cache_key] = analysis
+        
+        return analysis
     
-    def _analyze_content_elements(self, text):
+    def _analyze_content_elements(self, text, text_lower):
         """Detect content elements in user's text"""
-        text_lower = text.lower()
-        
-        # Count stats/numbers
-        stats_pattern = r'\d+%|\d+\s*(percent|million|billion|thousand|users|customers)'
-        stats_count = len(re.findall(stats_pattern, text))
+        # Count stats/numbers (lowercased like the competitor scan, so "50 Percent" counts too)
+        stats_count = len(_STATS_RE.findall(text_lower))
         
         # Detect examples
-        examples_pattern = r'(for example|case study|real-world|instance|specifically)'
-        examples_count = len(re.findall(examples_pattern, text_lower))
+        examples_count = len(_EXAMPLES_RE.findall(text_lower))
         
         # Detect comparisons
-        has_comparison = bool(re.search(r'(comparison|versus|vs\.|compared to|alternative)', text_lower))
+        has_comparison = bool(_COMPARISON_RE.search(text_lower))
         
         # Detect lists
         has_lists = text.count('•') > 2 or text.count('\n-') > 2 or text.count('1.') > 0
@@ -244,28 +304,16 @@ class SERPAnalyzer:
             'has_lists': has_lists
         }
     
-    def _suggest_missing_topics(self, keyword, user_count, avg_count):
+    def _suggest_missing_topics(self, keyword_lower, user_count, avg_count):
         """Suggest common missing topics based on keyword context"""
-        keyword_lower = keyword.lower()
-        
-        # Topic suggestions based on common patterns
-        topic_map = {
-            'laptop': ['Price comparisons', 'Battery life tests', 'Performance benchmarks', 'User reviews'],
-            'phone': ['Camera comparisons', 'Battery tests', 'Price analysis', 'User ratings'],
-            'software': ['Feature comparison', 'Pricing tiers', 'User testimonials', 'Integration guides'],
-            'service': ['Pricing breakdown', 'Customer reviews', 'Alternatives comparison', 'Setup guide'],
-            'product': ['Specs comparison', 'Price analysis', 'Customer feedback', 'Best use cases'],
-            'guide': ['Step-by-step tutorial', 'Common mistakes', 'Expert tips', 'FAQ section'],
-            'review': ['Pros and cons', 'Alternatives', 'Pricing', 'User feedback']
-        }
-        
-        # Find matching category
-        for category, topics in topic_map.items():
-            if category in keyword_lower:
-                return topics[:int(avg_count - user_count)]
+        # One pass finds every category present; map order decides between them
+        found = set(_TOPIC_RE.findall(keyword_lower))
+        if found:
+            category = next(category for category in _TOPIC_MAP if category in found)
+            return _TOPIC_MAP[category][:int(avg_count - user_count)]
         
         # Default generic topics
-        return ['Detailed comparisons', 'User testimonials', 'Expert analysis', 'Pricing breakdown']
+        return _DEFAULT_TOPICS[:]
     
     def _predict_ranking(self, score, word_ratio, user_topics, avg_topics):
         """Predict ranking position based on score"""
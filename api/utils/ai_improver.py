@@ -1,16 +1,202 @@
 import os
+import re
+import json
+import hashlib
+import functools
+import threading
+from concurrent.futures import Future
+import httpx
+from cachetools import TTLCache
 from openai import OpenAI
 from dotenv import load_dotenv
 
+# Token-accurate prompt trimming when tiktoken is installed; a character estimate otherwise
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
 load_dotenv()
 
+# Completions for identical requests (1 hour), keyed by a SHA-256 of model, messages and sampling settings
+_COMPLETION_CACHE = TTLCache(maxsize=512, ttl=3600)
+_COMPLETION_LOCK = threading.Lock()
+_CACHE_STATS = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+# Completions currently being fetched, by cache key; identical concurrent requests wait on the first one's Future
+_INFLIGHT = {}
+
+# Attempts after the first on 408/409/429/5xx and connection errors (the SDK backs off exponentially with jitter)
+_MAX_RETRIES = 4
+
+def _completion_key(model, messages, temperature, max_tokens, response_format=None):
+    """SHA-256 over everything that determines a completion"""
+    return hashlib.sha256(json.dumps(
+        {'model': model, 'messages': messages, 'temperature': temperature, 'max_tokens': max_tokens,
+         'response_format': response_format},
+        sort_keys=True
+    ).encode()).hexdigest()
+
+# Spacing-only differences between resubmissions of the same text
+# (leading indentation is content - nested lists and code blocks - so it is never touched)
+_TRAILING_SPACE_RE = re.compile(r'[ \t]+$', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# Rewrite instruction per paragraph issue type
+_PARAGRAPH_INSTRUCTIONS = {
+    'humanization': 'Make this sound more natural and conversational. Vary sentence structure and length. Remove AI-like patterns.',
+    'readability': 'Simplify this paragraph. Use shorter sentences and simpler words. Improve readability.',
+    'keyword': 'Rewrite this to naturally include the target keyword 2-3 times without keyword stuffing.',
+    'engagement': 'Make this more engaging. Add a question or hook. Make it more compelling.'
+}
+
+# Fixed prompt text, built once at import; only the user's content is appended per call,
+# so every request of a kind starts with the same bytes (OpenAI caches repeated prompt prefixes)
+_FIXES_SYSTEM = "You are an expert SEO and content strategist. Improve content based on specific feedback."
+_FIXES_INSTRUCTIONS = "Please rewrite the content below focusing on fixing the listed issues while maintaining the core message. Make it more engaging, SEO-friendly, and unique."
+
+_META_INSTRUCTIONS = """Write a compelling meta description (150-160 characters) for the content below.
+
+Requirements:
+- Exactly 150-160 characters
+- Include target keyword naturally
+- Compelling and click-worthy
+- Accurate summary of content"""
+
+_SUBTOPICS_INSTRUCTIONS = """Suggest 5-7 subtopics that top-ranking content for the keyword below should cover.
+Return as a numbered list of subtopics, each 3-6 words."""
+
+_BATCH_INSTRUCTIONS = """Apply this to each paragraph in the JSON array below independently, keeping each one's meaning.
+Return a JSON object of the form {"paragraphs": [{"id": <id>, "rewritten": "<text>"}]} with one entry per input id."""
+
+_SEO_SYSTEM = "You are an expert SEO content writer. Optimize content for search engines while keeping it natural and engaging."
+_SEO_INSTRUCTIONS = """Rewrite this content to be SEO-optimized for the target keyword given below.
+
+Requirements:
+- Include the target keyword naturally 3-5 times
+- Use semantic keywords and related terms
+- Improve heading structure with keywords
+- Add relevant examples and data
+- Maintain readability and natural flow"""
+
+_HUMANIZE_SYSTEM = "You are an expert content writer who excels at making text sound natural and human. Avoid AI-like patterns."
+_HUMANIZE_INSTRUCTIONS = """Rewrite this content to sound more human, natural, and conversational.
+
+Requirements:
+- Vary sentence structure and length
+- Use contractions naturally (e.g., "you're" instead of "you are")
+- Add personality and warmth
+- Remove robotic or AI-like patterns
+- Include transitional phrases
+- Make it engaging and relatable"""
+
+_READABILITY_SYSTEM = "You are an expert at simplifying complex content. Make text clear, concise, and easy to understand."
+_READABILITY_INSTRUCTIONS = """Rewrite this content to be easier to read and understand.
+
+Requirements:
+- Use simpler words (8th-grade reading level)
+- Shorter sentences (15-20 words average)
+- Clear and direct language
+- Break complex ideas into smaller parts
+- Use bullet points where appropriate
+- Add examples to clarify concepts"""
+
+_ENGAGEMENT_SYSTEM = "You are an expert copywriter who creates compelling, engaging content that captures attention and drives action."
+_ENGAGEMENT_INSTRUCTIONS = """Rewrite this content to be more engaging, compelling, and captivating.
+
+Requirements:
+- Start with a strong hook
+- Use power words and emotional triggers
+- Add questions to engage readers
+- Include storytelling elements
+- Create urgency or curiosity
+- Use active voice
+- Add specific examples and data points"""
+
+# Output budget per paragraph in a batched rewrite, and the model's ceiling for one response
+_TOKENS_PER_PARAGRAPH = 300
+_MAX_BATCH_TOKENS = 4000
+
+# Paragraphs per batched completion, so every one keeps its full output budget
+_MAX_BATCH_PARAGRAPHS = _MAX_BATCH_TOKENS // _TOKENS_PER_PARAGRAPH
+
+# Rewrites run on the fast model; the stronger one is kept for content the analysis scored severely low
+_FAST_MODEL = "gpt-4o-mini"
+_STRONG_MODEL = "gpt-4o"
+_SEVERE_SCORE = 40
+
+def _route_model(analysis=None):
+    """Pick the rewrite model from the analyzer scores (any score below _SEVERE_SCORE gets the strong model)"""
+    for result in (analysis.values() if isinstance(analysis, dict) else ()):
+        score = result.get('score') if isinstance(result, dict) else None
+        if isinstance(score, (int, float)) and score < _SEVERE_SCORE:
+            return _STRONG_MODEL
+    return _FAST_MODEL
+
+# Token budgets for the user text spliced into each prompt
+_PREVIEW_TOKENS = 125
+_FIXES_TOKENS = 375
+_REWRITE_TOKENS = 500
+
+# Fallback estimate for English text, and how many characters a single token can safely be assumed to span
+_CHARS_PER_TOKEN = 4
+_MAX_CHARS_PER_TOKEN = 16
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    """cl100k_base tokenizer (close enough to the gpt-4o family's for budgeting), or None when tiktoken or its vocabulary can't be loaded"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding('cl100k_base')
+    except Exception:
+        # The vocabulary is downloaded on first use; without network fall back to the estimate
+        return None
+
+def _trim_to_tokens(text, max_tokens):
+    """Cut text to at most max_tokens tokens"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * _CHARS_PER_TOKEN]
+    
+    # Only encode a prefix that is certain to hold max_tokens tokens
+    head = text[:max_tokens * _MAX_CHARS_PER_TOKEN]
+    tokens = encoding.encode(head, disallowed_special=())
+    return head if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+def _normalize_whitespace(text):
+    """
+    Collapse spacing variants (line endings, trailing spaces, blank-line runs) so retried text
+    hits the completion cache and blank lines don't eat into the prompt's token budget
+    """
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = _TRAILING_SPACE_RE.sub('', text)
+    return _BLANK_LINES_RE.sub('\n\n', text).strip('\n')
+
+@functools.lru_cache(maxsize=4)
+def _get_client(api_key):
+    """
+    One OpenAI client per API key for the whole process
+    Keeps TLS connections alive between requests; the pool is sized for bursts and
+    a short connect timeout fails fast instead of hanging for the SDK's 10-minute default
+    Rate limits and dropped connections are retried with backoff before an error reaches the caller
+    """
+    return OpenAI(
+        api_key=api_key,
+        max_retries=_MAX_RETRIES,
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=httpx.Timeout(120.0, connect=5.0)
+        )
+    )
+
 class AIContentImprover:
     """Use OpenAI to generate content improvements"""
     
     def __init__(self):
         api_key = os.getenv('OPENAI_API_KEY')
         try:
-            self.client = OpenAI(api_key=api_key) if api_key else None
+            self.client = _get_client(api_key) if api_key else None
         except TypeError as e:
             # Handle version incompatibility
             print(f"OpenAI client initialization error: {e}")
@@ -32,18 +218,16 @@ class AIContentImprover:
             # Build improvement prompt from analysis
             prompt = self._build_improvement_prompt(text, analysis_results)
             
-            response = self.client.chat.completions.create(
-                model="gpt-4",
+            improved_content = self._complete(
+                model=_route_model(analysis_results),
                 messages=[
-                    {"role": "system", "content": "You are an expert SEO and content strategist. Improve content based on specific feedback."},
+                    {"role": "system", "content": _FIXES_SYSTEM},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
                 max_tokens=2000
             )
             
-            improved_content = response.choices[0].message.content
-            
             return {
                 'success': True,
                 'improved_content': improved_content,
@@ -62,26 +246,20 @@ class AIContentImprover:
             return None
         
         try:
-            prompt = f"""Write a compelling meta description (150-160 characters) for this content:
+            prompt = _META_INSTRUCTIONS + f"""
 
 Title: {title}
 Target Keyword: {target_keyword}
-Content Preview: {text[:500]}
-
-Requirements:
-- Exactly 150-160 characters
-- Include target keyword naturally
-- Compelling and click-worthy
-- Accurate summary of content"""
+Content Preview: {_trim_to_tokens(_normalize_whitespace(text), _PREVIEW_TOKENS)}"""
 
-            response = self.client.chat.completions.create(
+            content = self._complete(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
+                temperature=0,
                 max_tokens=100
             )
             
-            return response.choices[0].message.content.strip('"')
+            return content.strip('"')
             
         except:
             return None
@@ -101,20 +279,19 @@ Competitor patterns:
 - {serp_data['patterns'].get('has_comparisons', 0)}% have comparisons
 """
             
-            prompt = f"""For the keyword "{keyword}", suggest 5-7 subtopics that top-ranking content should cover.
+            prompt = _SUBTOPICS_INSTRUCTIONS + f"""
 
-{competitor_info}
+Keyword: "{keyword}"
+{competitor_info}"""
 
-Return as a numbered list of subtopics, each 3-6 words."""
-
-            response = self.client.chat.completions.create(
+            content = self._complete(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7,
                 max_tokens=200
             )
             
-            subtopics = response.choices[0].message.content.strip().split('\n')
+            subtopics = content.strip().split('\n')
             return [s.strip() for s in subtopics if s.strip()]
             
         except:
@@ -126,33 +303,138 @@ Return as a numbered list of subtopics, each 3-6 words."""
             return paragraph
         
         try:
-            instructions = {
-                'humanization': 'Make this sound more natural and conversational. Vary sentence structure and length. Remove AI-like patterns.',
-                'readability': 'Simplify this paragraph. Use shorter sentences and simpler words. Improve readability.',
-                'keyword': 'Rewrite this to naturally include the target keyword 2-3 times without keyword stuffing.',
-                'engagement': 'Make this more engaging. Add a question or hook. Make it more compelling.'
-            }
-            
-            instruction = instructions.get(issue_type, 'Improve this paragraph')
+            instruction = _PARAGRAPH_INSTRUCTIONS.get(issue_type, 'Improve this paragraph')
             
             prompt = f"""{instruction}
 
-Original: {paragraph}
+Original: {_normalize_whitespace(paragraph)}
 
 Rewritten (same meaning, improved style):"""
 
-            response = self.client.chat.completions.create(
+            content = self._complete(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7,
                 max_tokens=300
             )
             
-            return response.choices[0].message.content.strip()
+            return content.strip()
             
         except:
             return paragraph
     
+    def rewrite_paragraphs_batch(self, paragraphs, issue_type):
+        """
+        Rewrite several paragraphs with one completion per group of _MAX_BATCH_PARAGRAPHS
+        instead of one round trip each
+        Returns the rewrites in input order; a paragraph the model skipped comes back unchanged
+        """
+        if not self.client:
+            return {'success': False, 'error': 'OpenAI API key not configured'}
+        
+        try:
+            instruction = _PARAGRAPH_INSTRUCTIONS.get(issue_type, 'Improve this paragraph')
+            improved = []
+            for start in range(0, len(paragraphs), _MAX_BATCH_PARAGRAPHS):
+                group = paragraphs[start:start + _MAX_BATCH_PARAGRAPHS]
+                improved.extend(self._rewrite_group(group, instruction))
+            
+            return {'success': True, 'improved_paragraphs': improved}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    def _rewrite_group(self, paragraphs, instruction):
+        """One batched completion; raises if the reply was cut off or is not a JSON object"""
+        items = [{'id': idx, 'text': _normalize_whitespace(p)} for idx, p in enumerate(paragraphs)]
+        prompt = f"{instruction}\n\n{_BATCH_INSTRUCTIONS}\n\n{json.dumps(items)}"
+        
+        content = self._complete(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7,
+            max_tokens=_TOKENS_PER_PARAGRAPH * len(paragraphs),
+            response_format={"type": "json_object"}
+        )
+        
+        reply = json.loads(content)
+        if not isinstance(reply, dict):
+            raise ValueError('Paragraph rewrite reply was not a JSON object')
+        entries = reply.get('paragraphs') or []
+        
+        rewritten = {}
+        for item in entries:
+            if not isinstance(item, dict) or not isinstance(item.get('rewritten'), str):
+                continue
+            try:
+                # Models sometimes echo the id back as a string
+                rewritten[int(item['id'])] = item['rewritten'].strip()
+            except (KeyError, TypeError, ValueError):
+                continue
+        return [rewritten.get(idx) or p for idx, p in enumerate(paragraphs)]
+    
+    def cache_stats(self):
+        """Hit/miss counters for the completion cache"""
+        with _COMPLETION_LOCK:
+            return dict(_CACHE_STATS, size=len(_COMPLETION_CACHE))
+    
+    def _complete(self, model, messages, temperature, max_tokens, response_format=None):
+        """
+        Chat completion with an exact-match response cache in front
+        Returns the message content; identical requests within the TTL are not billed again,
+        and identical requests arriving while one is in flight share its result
+        """
+        key = _completion_key(model, messages, temperature, max_tokens, response_format)
+        
+        with _COMPLETION_LOCK:
+            cached = _COMPLETION_CACHE.get(key)
+            pending = _INFLIGHT.get(key) if cached is None else None
+            if cached is not None:
+                _CACHE_STATS['hits'] += 1
+            elif pending is not None:
+                _CACHE_STATS['coalesced'] += 1
+            else:
+                _CACHE_STATS['misses'] += 1
+                _INFLIGHT[key] = future = Future()
+        if cached is not None:
+            return cached
+        if pending is not None:
+            return pending.result()
+        
+        content = None
+        try:
+            # Only send response_format when asked for, so plain calls stay as before
+            extra = {'response_format': response_format} if response_format else {}
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **extra
+            )
+            reply = response.choices[0].message.content
+            
+            # A JSON reply that was cut off at max_tokens or is malformed is an error, and never cached
+            if response_format:
+                if response.choices[0].finish_reason == 'length':
+                    raise ValueError(f"Completion was truncated at max_tokens={max_tokens}")
+                try:
+                    json.loads(reply or '')
+                except ValueError:
+                    raise ValueError("Completion was not valid JSON")
+            content = reply
+        except BaseException as e:
+            # Waiting requests get the same error rather than hanging
+            future.set_exception(e)
+            raise
+        finally:
+            with _COMPLETION_LOCK:
+                del _INFLIGHT[key]
+                if content:
+                    _COMPLETION_CACHE[key] = content
+        
+        future.set_result(content)
+        return content
+    
     def _build_improvement_prompt(self, text, analysis):
         """Build comprehensive improvement prompt"""
         issues = []
@@ -167,14 +449,13 @@ Rewritten (same meaning, improved style):"""
         if 'differentiation' in analysis and analysis['differentiation'].get('issues'):
             issues.extend([f"Uniqueness: {issue}" for issue in analysis['differentiation']['issues'][:1]])
         
-        prompt = f"""Improve this content based on these specific issues:
+        prompt = _FIXES_INSTRUCTIONS + f"""
 
+Issues to fix:
 {chr(10).join(f'- {issue}' for issue in issues[:5])}
 
 Original Content:
-{text[:1500]}
-
-Please rewrite focusing on fixing these issues while maintaining the core message. Make it more engaging, SEO-friendly, and unique."""
+{_trim_to_tokens(_normalize_whitespace(text), _FIXES_TOKENS)}"""
 
         return prompt
     
@@ -199,31 +480,7 @@ Please rewrite focusing on fixing these issues while maintaining the core messag
             return {'success': False, 'error': 'OpenAI API key not configured'}
         
         try:
-            prompt = f"""Rewrite this content to be SEO-optimized for the keyword: "{target_keyword}"
-
-Requirements:
-- Include the target keyword naturally 3-5 times
-- Use semantic keywords and related terms
-- Improve heading structure with keywords
-- Add relevant examples and data
-- Maintain readability and natural flow
-
-Original Content:
-{text[:2000]}
-
-SEO-Optimized Version:"""
-
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert SEO content writer. Optimize content for search engines while keeping it natural and engaging."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2500
-            )
-            
-            improved = response.choices[0].message.content
+            improved = self._complete(**self._seo_request(text, target_keyword, analysis))
             
             return {
                 'success': True,
@@ -238,38 +495,13 @@ SEO-Optimized Version:"""
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def humanize_content(self, text):
+    def humanize_content(self, text, analysis=None):
         """Make content sound more human and natural"""
         if not self.client:
             return {'success': False, 'error': 'OpenAI API key not configured'}
         
         try:
-            prompt = f"""Rewrite this content to sound more human, natural, and conversational.
-
-Requirements:
-- Vary sentence structure and length
-- Use contractions naturally (e.g., "you're" instead of "you are")
-- Add personality and warmth
-- Remove robotic or AI-like patterns
-- Include transitional phrases
-- Make it engaging and relatable
-
-Original Content:
-{text[:2000]}
-
-Humanized Version:"""
-
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert content writer who excels at making text sound natural and human. Avoid AI-like patterns."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.8,
-                max_tokens=2500
-            )
-            
-            improved = response.choices[0].message.content
+            improved = self._complete(**self._humanize_request(text, analysis))
             
             return {
                 'success': True,
@@ -284,38 +516,13 @@ Humanized Version:"""
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def improve_readability(self, text):
+    def improve_readability(self, text, analysis=None):
         """Simplify content for better readability"""
         if not self.client:
             return {'success': False, 'error': 'OpenAI API key not configured'}
         
         try:
-            prompt = f"""Rewrite this content to be easier to read and understand.
-
-Requirements:
-- Use simpler words (8th-grade reading level)
-- Shorter sentences (15-20 words average)
-- Clear and direct language
-- Break complex ideas into smaller parts
-- Use bullet points where appropriate
-- Add examples to clarify concepts
-
-Original Content:
-{text[:2000]}
-
-Simplified Version:"""
-
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert at simplifying complex content. Make text clear, concise, and easy to understand."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.6,
-                max_tokens=2500
-            )
-            
-            improved = response.choices[0].message.content
+            improved = self._complete(**self._readability_request(text, analysis))
             
             return {
                 'success': True,
@@ -330,39 +537,13 @@ Simplified Version:"""
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def boost_engagement(self, text):
+    def boost_engagement(self, text, analysis=None):
         """Make content more engaging and compelling"""
         if not self.client:
             return {'success': False, 'error': 'OpenAI API key not configured'}
         
         try:
-            prompt = f"""Rewrite this content to be more engaging, compelling, and captivating.
-
-Requirements:
-- Start with a strong hook
-- Use power words and emotional triggers
-- Add questions to engage readers
-- Include storytelling elements
-- Create urgency or curiosity
-- Use active voice
-- Add specific examples and data points
-
-Original Content:
-{text[:2000]}
-
-Engaging Version:"""
-
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert copywriter who creates compelling, engaging content that captures attention and drives action."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.8,
-                max_tokens=2500
-            )
-            
-            improved = response.choices[0].message.content
+            improved = self._complete(**self._engagement_request(text, analysis))
             
             return {
                 'success': True,
@@ -376,3 +557,122 @@ Engaging Version:"""
             }
         except Exception as e:
             return {'success': False, 'error': str(e)}
+    
+    def stream_rewrite(self, improvement_type, text, target_keyword="", analysis=None):
+        """
+        Yield a full-content rewrite chunk by chunk as the model produces it
+        improvement_type is one of 'seo', 'humanize', 'readability', 'engagement'
+        """
+        if not self.client:
+            raise ValueError('OpenAI API key not configured')
+        
+        if improvement_type == 'seo':
+            request = self._seo_request(text, target_keyword, analysis)
+        elif improvement_type == 'humanize':
+            request = self._humanize_request(text, analysis)
+        elif improvement_type == 'readability':
+            request = self._readability_request(text, analysis)
+        elif improvement_type == 'engagement':
+            request = self._engagement_request(text, analysis)
+        else:
+            raise ValueError(f"Streaming is not supported for improvement type: {improvement_type}")
+        
+        # A cached completion is sent as a single chunk
+        key = _completion_key(**request)
+        with _COMPLETION_LOCK:
+            cached = _COMPLETION_CACHE.get(key)
+            _CACHE_STATS['hits' if cached is not None else 'misses'] += 1
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
+        for chunk in self.client.chat.completions.create(stream=True, **request):
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+        
+        # Only a stream that ran to the end is cached
+        content = ''.join(parts)
+        if content:
+            with _COMPLETION_LOCK:
+                _COMPLETION_CACHE[key] = content
+    
+    def _seo_request(self, text, target_keyword, analysis):
+        """Completion arguments for the SEO rewrite"""
+        prompt = _SEO_INSTRUCTIONS + f"""
+
+Target Keyword: "{target_keyword}"
+
+Original Content:
+{_trim_to_tokens(_normalize_whitespace(text), _REWRITE_TOKENS)}
+
+SEO-Optimized Version:"""
+
+        return {
+            'model': _route_model(analysis),
+            'messages': [
+                {"role": "system", "content": _SEO_SYSTEM},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.7,
+            'max_tokens': 2500
+        }
+    
+    def _humanize_request(self, text, analysis):
+        """Completion arguments for the humanizing rewrite"""
+        prompt = _HUMANIZE_INSTRUCTIONS + f"""
+
+Original Content:
+{_trim_to_tokens(_normalize_whitespace(text), _REWRITE_TOKENS)}
+
+Humanized Version:"""
+
+        return {
+            'model': _route_model(analysis),
+            'messages': [
+                {"role": "system", "content": _HUMANIZE_SYSTEM},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.8,
+            'max_tokens': 2500
+        }
+    
+    def _readability_request(self, text, analysis):
+        """Completion arguments for the readability rewrite"""
+        prompt = _READABILITY_INSTRUCTIONS + f"""
+
+Original Content:
+{_trim_to_tokens(_normalize_whitespace(text), _REWRITE_TOKENS)}
+
+Simplified Version:"""
+
+        return {
+            'model': _route_model(analysis),
+            'messages': [
+                {"role": "system", "content": _READABILITY_SYSTEM},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.6,
+            'max_tokens': 2500
+        }
+    
+    def _engagement_request(self, text, analysis):
+        """Completion arguments for the engagement rewrite"""
+        prompt = _ENGAGEMENT_INSTRUCTIONS + f"""
+
+Original Content:
+{_trim_to_tokens(_normalize_whitespace(text), _REWRITE_TOKENS)}
+
+Engaging Version:"""
+
+        return {
+            'model': _route_model(analysis),
+            'messages': [
+                {"role": "system", "content": _ENGAGEMENT_SYSTEM},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.8,
+            'max_tokens': 2500
+        }
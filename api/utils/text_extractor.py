@@ -1,7 +1,32 @@
-import requests
-from bs4 import BeautifulSoup
+import atexit
+import httpx
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urlparse
-import re
+
+# Shared pooled client for URL extraction, so repeat hosts reuse their TCP/TLS connection
+# (the transport retries a failed connect once; HTTP/2 and pool limits must be set on it)
+_HTTP = httpx.Client(
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=1,
+        limits=httpx.Limits(max_connections=20)
+    ),
+    timeout=10.0,
+    follow_redirects=True,
+    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+)
+atexit.register(_HTTP.close)
+
+# Upper bound on how much of a page is read into memory, matching URL mode in the entry points
+_MAX_PAGE_BYTES = 5 * 1024 * 1024
+_HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Longest input still treated as a URL; anything longer is article text
+_MAX_URL_LENGTH = 2048
+
+# Every node _extract_from_url reads, matched in a single selector pass
+_HEADER_TAGS = frozenset(('h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
+_EXTRACT_SELECTOR = 'title, meta[name="description"], main, article, ' + ', '.join(sorted(_HEADER_TAGS))
 
 class TextExtractor:
     """Extract text content from URL or raw text input"""
@@ -19,8 +44,16 @@ class TextExtractor:
     
     def _is_url(self, text):
         """Check if input is a valid URL"""
+        # Cheap prefix and shape checks first, so pasted articles never reach urlparse
+        if not text.lstrip()[:8].lower().startswith(('http://', 'https://')):
+            return False
+        
+        url = text.strip()
+        if len(url) > _MAX_URL_LENGTH or len(url.split(None, 1)) > 1:
+            return False
+        
         try:
-            result = urlparse(text.strip())
+            result = urlparse(url)
             return all([result.scheme, result.netloc])
         except:
             return False
@@ -28,46 +61,64 @@ class TextExtractor:
     def _extract_from_url(self, url):
         """Scrape content from URL"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
+            with _HTTP.stream('GET', url) as response:
+                response.raise_for_status()
+                
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                if content_type and content_type not in _HTML_CONTENT_TYPES:
+                    raise ValueError(f"Unsupported content type: {content_type}")
+                
+                body = bytearray()
+                for chunk in response.iter_bytes(65536):
+                    body.extend(chunk)
+                    if len(body) >= _MAX_PAGE_BYTES:
+                        break
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            tree = LexborHTMLParser(bytes(body[:_MAX_PAGE_BYTES]), encoding=True)
             
             # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "aside"]):
-                script.decompose()
+            for node in tree.css('script, style, nav, footer, aside'):
+                node.decompose()
+            
+            # One selector pass collects every node we read below, in document order
+            title = meta_desc = main = article = None
+            header_nodes = []
+            for node in tree.css(_EXTRACT_SELECTOR):
+                tag = node.tag
+                if tag in _HEADER_TAGS:
+                    header_nodes.append(node)
+                elif tag == 'title':
+                    title = title or node
+                elif tag == 'meta':
+                    meta_desc = meta_desc or node
+                elif tag == 'main':
+                    main = main or node
+                elif tag == 'article':
+                    article = article or node
             
             # Extract title
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else ""
+            title_text = title.text().strip() if title else ""
             
             # Extract meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            meta_description = meta_desc.get('content', '').strip() if meta_desc else ""
+            meta_description = (meta_desc.attributes.get('content') or '').strip() if meta_desc else ""
             
-            # Extract headers
-            headers_list = []
-            for level in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                for header in soup.find_all(level):
-                    headers_list.append({
-                        'level': level,
-                        'text': header.get_text().strip()
-                    })
+            # Extract headers (stable sort keeps h1s, then h2s, ... each in page order)
+            headers_list = [
+                {'level': node.tag, 'text': node.text().strip()}
+                for node in sorted(header_nodes, key=lambda node: node.tag)
+            ]
             
             # Extract main content text
             # Try to find main content area
-            main_content = soup.find('main') or soup.find('article') or soup.find('body')
+            main_content = main or article or tree.body
             
             if main_content:
-                text = main_content.get_text(separator=' ', strip=True)
+                text = main_content.text(separator=' ', strip=True, skip_empty=True)
             else:
-                text = soup.get_text(separator=' ', strip=True)
+                text = tree.root.text(separator=' ', strip=True, skip_empty=True) if tree.root else ""
             
             # Clean up whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
+            text = ' '.join(text.split())
             
             return {
                 'text': text,
@@ -1,6 +1,54 @@
 import re
 from collections import Counter
-import math
+import numpy as np
+from utils.phrase_matcher import build_phrase_automaton, scan_phrases
+from utils.text_context import AnalyzedText
+
+# Precompiled patterns (compiled once at import instead of on every analyze call)
+_ADVERB_RE = re.compile(r'\b(very|really|quite|extremely|incredibly|absolutely|definitely)\b')
+_FRAGMENT_RE = re.compile(r'\b(but|and|so)\s+[A-Z]')
+_INFORMAL_RE = re.compile(r'\b(gonna|wanna|gotta|yeah|nah)\b')
+_FIRST_PERSON_RE = re.compile(r'\b(i|we|my|our|me|us)\b')
+_HEATMAP_TRANSITION_RE = re.compile(r'\b(moreover|furthermore|additionally|consequently|nevertheless)\b')
+
+# Sentence-level phrases highlighted in the heatmap
+_HEATMAP_PHRASES = (
+    'it is important to note', 'it is worth noting', 'in today\'s',
+    'as we\'ve seen', 'to sum up'
+)
+_HEATMAP_DELVE_RE = re.compile(r'delve')
+_HEATMAP_PHRASE_RE = re.compile('|'.join(re.escape(p) for p in _HEATMAP_PHRASES))
+
+# Fixed phrase lists, scanned together in one Aho-Corasick pass per analyze call
+_PHRASES = {
+    'delve': ('delve',),
+    'formulaic': (
+        'it is important to note',
+        'it is worth noting',
+        'in today\'s world',
+        'in today\'s digital age',
+        'in conclusion',
+        'to sum up',
+        'as we\'ve seen'
+    ),
+    'contraction': (
+        'don\'t', 'can\'t', 'won\'t', 'isn\'t', 'aren\'t',
+        'hasn\'t', 'haven\'t', 'it\'s', 'that\'s', 'what\'s'
+    ),
+    # Whole-text hits tell the heatmap which per-sentence scans can be skipped
+    'heatmap_phrase': _HEATMAP_PHRASES,
+    'heatmap_transition': ('moreover', 'furthermore', 'additionally', 'consequently', 'nevertheless'),
+}
+_PHRASE_AC = build_phrase_automaton(_PHRASES)
+
+# Below this many sentences the uniform-structure check has too little to compare
+_MIN_STRUCTURE_SENTENCES = 5
+
+# AI loves these transitions (matched as whole words)
+_TRANSITION_WORDS = frozenset([
+    'moreover', 'furthermore', 'additionally', 'consequently',
+    'nevertheless', 'nonetheless', 'thus', 'hence', 'therefore'
+])
 
 class HumanizationAnalyzer:
     """Analyze how human vs AI-generated the content sounds"""
@@ -9,13 +57,16 @@ class HumanizationAnalyzer:
         """
         Analyze humanization factors
         Returns score with heatmap data for AI patterns
+        text may be a str or an AnalyzedText shared with the other analyzers
         """
         score = 100
         issues = []
         recommendations = []
         details = {}
         
-        sentences = self._split_sentences(text)
+        doc = AnalyzedText.of(text)
+        text, text_lower = doc.text, doc.lower
+        sentences = self._split_sentences(doc)
         
         if len(sentences) < 3:
             return {
@@ -25,8 +76,11 @@ class HumanizationAnalyzer:
                 'details': {}
             }
         
+        phrase_hits = scan_phrases(_PHRASE_AC, text_lower)
+        sentences_lower = [s.lower() for s in sentences]
+        
         # 1. Sentence Starter Variety with example patterns
-        starters = self._analyze_sentence_starters(sentences)
+        starters = self._analyze_sentence_starters(sentences_lower)
         details['sentence_starters'] = starters
         
         if starters['repetition_rate'] > 40:
@@ -39,8 +93,11 @@ class HumanizationAnalyzer:
             issues.append(f"{starters['repetition_rate']}% sentences have repetitive starts")
             recommendations.append("Mix up sentence beginnings more")
         
+        # Per-sentence word counts, shared by length stats and the heatmap
+        word_counts = np.fromiter((len(s.split()) for s in sentences), dtype=np.int32, count=len(sentences))
+        
         # 2. Sentence Length Variation with detailed metrics
-        length_analysis = self._analyze_sentence_lengths(sentences)
+        length_analysis = self._analyze_sentence_lengths(word_counts)
         details['sentence_lengths'] = length_analysis
         
         if length_analysis['std_dev'] < 3:
@@ -52,7 +109,7 @@ class HumanizationAnalyzer:
             issues.append(f"Moderate sentence length variation (avg {length_analysis['avg']:.0f} words, std dev {length_analysis['std_dev']:.1f})")
         
         # 3. AI Pattern Detection
-        ai_patterns = self._detect_ai_patterns(text, sentences)
+        ai_patterns = self._detect_ai_patterns(doc, sentences_lower, word_counts, phrase_hits)
         details['ai_patterns'] = ai_patterns
         
         if ai_patterns['ai_score'] > 60:
@@ -65,7 +122,7 @@ class HumanizationAnalyzer:
             issues.append(f"Moderate AI patterns detected: {ai_patterns['ai_score']}%")
         
         # 4. Transition Word Overuse
-        transitions = self._analyze_transitions(text)
+        transitions = self._analyze_transitions(doc, len(sentences))
         details['transitions'] = transitions
         
         if transitions['overuse_rate'] > 30:
@@ -74,7 +131,7 @@ class HumanizationAnalyzer:
             recommendations.append("Reduce formulaic transitions like 'moreover', 'furthermore', 'additionally'")
         
         # 5. Natural Flow Indicators
-        flow = self._analyze_natural_flow(text, sentences)
+        flow = self._analyze_natural_flow(text, text_lower, phrase_hits)
         details['natural_flow'] = flow
         
         if not flow['has_contractions']:
@@ -88,7 +145,7 @@ class HumanizationAnalyzer:
             recommendations.append("Add rhetorical questions to engage readers")
         
         # 6. Generate Heatmap Data
-        heatmap = self._generate_heatmap(text, sentences, ai_patterns)
+        heatmap = self._generate_heatmap(sentences, sentences_lower, word_counts, phrase_hits)
         details['heatmap'] = heatmap
         
         score = max(0, score)
@@ -100,95 +157,74 @@ class HumanizationAnalyzer:
             'details': details
         }
     
-    def _split_sentences(self, text):
+    def _split_sentences(self, doc):
         """Split text into sentences"""
         # Simple sentence splitter
-        sentences = re.split(r'[.!?]+', text)
+        sentences = doc.sentence_parts
         return [s.strip() for s in sentences if len(s.strip()) > 10]
     
-    def _analyze_sentence_starters(self, sentences):
-        """Analyze how sentences start"""
+    def _analyze_sentence_starters(self, sentences_lower):
+        """Analyze how sentences start (takes already-lowercased sentences)"""
         starters = []
         
-        for sentence in sentences:
-            # Get first 1-2 words
-            words = sentence.split()
-            if len(words) > 0:
-                starter = words[0].lower()
-                starters.append(starter)
+        for sentence in sentences_lower:
+            # Get the first word (split at most once instead of tokenizing the whole sentence)
+            parts = sentence.split(None, 1)
+            if parts:
+                starters.append(parts[0])
         
-        # Count repetitions
+        # Count repetitions - only the single most common starter is needed
         starter_counts = Counter(starters)
-        most_common = starter_counts.most_common(3)
+        most_common_word, top_repetitions = starter_counts.most_common(1)[0] if starter_counts else ('same way', 0)
         
         # Calculate repetition rate
         total = len(starters)
-        top_repetitions = sum(count for _, count in most_common[:1])
         repetition_rate = int((top_repetitions / total) * 100) if total > 0 else 0
         
-        # Get the actual most common starter word for reporting
-        most_common_word = most_common[0][0] if most_common else 'same way'
-        
         return {
             'total_sentences': total,
-            'unique_starters': len(set(starters)),
+            'unique_starters': len(starter_counts),
             'repetition_rate': repetition_rate,
-            'most_common': most_common_word,
-            'top_starters': most_common
+            'most_common': most_common_word
         }
     
-    def _analyze_sentence_lengths(self, sentences):
-        """Analyze sentence length variation"""
-        lengths = [len(s.split()) for s in sentences]
+    def _analyze_sentence_lengths(self, lengths):
+        """Analyze sentence length variation from an int array of per-sentence word counts"""
+        if not lengths.size:
+            return {'avg': 0, 'avg_length': 0, 'std_dev': 0, 'min_length': 0, 'max_length': 0}
         
-        avg_length = sum(lengths) / len(lengths) if lengths else 0
-        
-        # Calculate standard deviation
-        if len(lengths) > 1:
-            variance = sum((x - avg_length) ** 2 for x in lengths) / len(lengths)
-            std_dev = math.sqrt(variance)
-        else:
-            std_dev = 0
+        # Vectorized reductions; std is the population standard deviation
+        avg_length = float(lengths.mean())
+        std_dev = float(lengths.std()) if lengths.size > 1 else 0
         
         return {
             'avg': round(avg_length, 1),
             'avg_length': round(avg_length, 1),
             'std_dev': round(std_dev, 1),
-            'min_length': min(lengths) if lengths else 0,
-            'max_length': max(lengths) if lengths else 0
+            'min_length': int(lengths.min()),
+            'max_length': int(lengths.max())
         }
     
-    def _detect_ai_patterns(self, text, sentences):
+    def _detect_ai_patterns(self, doc, sentences_lower, word_counts, phrase_hits):
         """Detect AI-specific writing patterns"""
-        text_lower = text.lower()
+        text, text_lower = doc.text, doc.lower
         ai_score = 0
         detected = []
         
         # Pattern 1: Overuse of "delve"
-        if 'delve' in text_lower:
+        if phrase_hits['delve']:
             ai_score += 15
             detected.append("uses 'delve' (rare in human writing)")
         
-        # Pattern 2: Formulaic phrases
-        formulaic_phrases = [
-            'it is important to note',
-            'it is worth noting',
-            'in today\'s world',
-            'in today\'s digital age',
-            'in conclusion',
-            'to sum up',
-            'as we\'ve seen'
-        ]
-        
-        formulaic_count = sum(1 for phrase in formulaic_phrases if phrase in text_lower)
+        # Pattern 2: Formulaic phrases (distinct phrases found)
+        formulaic_count = len(phrase_hits['formulaic'])
         if formulaic_count > 2:
             ai_score += 20
             detected.append(f"{formulaic_count} formulaic phrases")
         
         # Pattern 3: Excessive use of adverbs
-        adverb_pattern = r'\b(very|really|quite|extremely|incredibly|absolutely|definitely)\b'
-        adverb_count = len(re.findall(adverb_pattern, text_lower))
-        word_count = len(text.split())
+        adverb_count = len(_ADVERB_RE.findall(text_lower))
+        word_count = doc.word_count
         adverb_rate = (adverb_count / word_count) * 100 if word_count > 0 else 0
         
         if adverb_rate > 2:
@@ -197,44 +233,35 @@ class HumanizationAnalyzer:
         
         # Pattern 4: Perfect grammar (too perfect)
         # AI rarely makes grammar mistakes
-        has_fragments = bool(re.search(r'\b(but|and|so)\s+[A-Z]', text))
-        has_informal = bool(re.search(r'\b(gonna|wanna|gotta|yeah|nah)\b', text_lower))
+        has_fragments = bool(_FRAGMENT_RE.search(text))
+        has_informal = bool(_INFORMAL_RE.search(text_lower))
         
-        if not has_fragments and not has_informal and len(sentences) > 10:
+        if not has_fragments and not has_informal and len(sentences_lower) > 10:
             ai_score += 10
             detected.append("overly perfect grammar")
         
         # Pattern 5: Uniform sentence structure
-        sentence_patterns = []
-        for s in sentences[:10]:  # Check first 10
-            words = s.split()
-            if len(words) > 0:
-                # Simple pattern: first word + sentence length category
-                pattern = f"{words[0].lower()}_{len(words)//5}"
-                sentence_patterns.append(pattern)
-        
-        unique_patterns = len(set(sentence_patterns))
-        if unique_patterns < len(sentence_patterns) * 0.6:
-            ai_score += 15
-            detected.append("repetitive sentence structure")
+        if len(sentences_lower) >= _MIN_STRUCTURE_SENTENCES:
+            sentence_patterns = []
+            for s, length in zip(sentences_lower[:10], word_counts[:10].tolist()):  # Check first 10
+                parts = s.split(None, 1)
+                if parts:
+                    # Simple pattern: first word + sentence length category
+                    sentence_patterns.append((parts[0], length // 5))
+            
+            unique_patterns = len(set(sentence_patterns))
+            if unique_patterns < len(sentence_patterns) * 0.6:
+                ai_score += 15
+                detected.append("repetitive sentence structure")
         
         return {
             'ai_score': min(ai_score, 100),
             'detected_patterns': detected if detected else ['none detected']
         }
     
-    def _analyze_transitions(self, text):
+    def _analyze_transitions(self, doc, sentence_count):
         """Analyze transition word usage"""
-        text_lower = text.lower()
-        
-        # AI loves these transitions
-        ai_transitions = [
-            'moreover', 'furthermore', 'additionally', 'consequently',
-            'nevertheless', 'nonetheless', 'thus', 'hence', 'therefore'
-        ]
-        
-        transition_count = sum(text_lower.count(word) for word in ai_transitions)
-        sentence_count = len(self._split_sentences(text))
+        transition_count = sum(doc.word_counts[w] for w in _TRANSITION_WORDS)
         
         overuse_rate = int((transition_count / sentence_count) * 100) if sentence_count > 0 else 0
         
@@ -243,21 +270,17 @@ class HumanizationAnalyzer:
             'overuse_rate': overuse_rate
         }
     
-    def _analyze_natural_flow(self, text, sentences):
+    def _analyze_natural_flow(self, text, text_lower, phrase_hits):
         """Analyze natural, conversational indicators"""
-        text_lower = text.lower()
-        
         # Look for contractions (human indicator)
-        contractions = ['don\'t', 'can\'t', 'won\'t', 'isn\'t', 'aren\'t', 
-                       'hasn\'t', 'haven\'t', 'it\'s', 'that\'s', 'what\'s']
-        has_contractions = any(c in text_lower for c in contractions)
+        has_contractions = bool(phrase_hits['contraction'])
         
         # Look for questions
-        has_questions = '?' in text
         question_count = text.count('?')
+        has_questions = question_count > 0
         
         # Look for first-person
-        has_first_person = bool(re.search(r'\b(i|we|my|our|me|us)\b', text_lower))
+        has_first_person = bool(_FIRST_PERSON_RE.search(text_lower))
         
         return {
             'has_contractions': has_contractions,
@@ -266,38 +289,44 @@ class HumanizationAnalyzer:
             'has_first_person': has_first_person
         }
     
-    def _generate_heatmap(self, text, sentences, ai_patterns):
+    def _generate_heatmap(self, sentences, sentences_lower, word_counts, phrase_hits):
         """Generate heatmap data for highlighting AI patterns"""
-        # Return sentence-level scores for frontend highlighting
-        sentence_scores = []
+        # Return sentence-level scores for frontend highlighting (0 = human, 100 = AI)
+        # Scan all sentences in one joined string and map match offsets back to sentence indexes.
+        # An indicator with no hit in the whole-text phrase scan can't be in any sentence, so its scan is skipped.
+        checks = (
+            (_HEATMAP_DELVE_RE, phrase_hits['delve']),
+            (_HEATMAP_PHRASE_RE, phrase_hits['heatmap_phrase']),
+            (_HEATMAP_TRANSITION_RE, phrase_hits['heatmap_transition'])
+        )
+        if any(found for _, found in checks):
+            joined = '\n'.join(sentences_lower)
+            starts = np.cumsum([0] + [len(s) + 1 for s in sentences_lower[:-1]])
+        
+        # Check for AI indicators
+        delve_hits, formulaic_hits, transition_hits = [
+            self._sentence_hits(pattern, joined, starts) if found else np.zeros(len(sentences), dtype=bool)
+            for pattern, found in checks
+        ]
         
-        for i, sentence in enumerate(sentences):
-            score = 0  # 0 = human, 100 = AI
-            
-            sentence_lower = sentence.lower()
-            
-            # Check for AI indicators
-            if 'delve' in sentence_lower:
-                score += 30
-            
-            if any(phrase in sentence_lower for phrase in [
-                'it is important to note', 'it is worth noting', 'in today\'s',
-                'as we\'ve seen', 'to sum up'
-            ]):
-                score += 25
-            
-            if re.search(r'\b(moreover|furthermore|additionally|consequently|nevertheless)\b', sentence_lower):
-                score += 20
-            
-            # Check sentence length uniformity
-            word_count = len(sentence.split())
-            if 15 <= word_count <= 20:  # AI loves this range
-                score += 10
-            
-            sentence_scores.append({
+        # Check sentence length uniformity (AI loves the 15-20 word range)
+        uniform_length = (word_counts >= 15) & (word_counts <= 20)
+        
+        scores = np.minimum(30 * delve_hits + 25 * formulaic_hits + 20 * transition_hits + 10 * uniform_length, 100)
+        
+        return [
+            {
                 'sentence': sentence[:100] + '...' if len(sentence) > 100 else sentence,
-                'score': min(score, 100),
+                'score': score,
                 'index': i
-            })
-        
-        return sentence_scores
+            }
+            for i, (sentence, score) in enumerate(zip(sentences, scores.tolist()))
+        ]
+    
+    def _sentence_hits(self, pattern, joined, starts):
+        """Boolean array marking which sentences contain at least one match of pattern"""
+        hits = np.zeros(len(starts), dtype=bool)
+        offsets = [m.start() for m in pattern.finditer(joined)]
+        if offsets:
+            hits[np.searchsorted(starts, offsets, side='right') - 1] = True
+        return hits
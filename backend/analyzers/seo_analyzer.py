@@ -1,8 +1,20 @@
 import re
-import textstat
+from textstat.textstat import textstatistics
 import math
+from utils.text_context import AnalyzedText
 from collections import Counter
 
+# Private textstat instance so global textstat.set_lang()/set_rounding() calls can't shift our scores
+_TEXTSTAT = textstatistics()
+
+# Below this many words readability and keyword scores aren't meaningful
+_MIN_WORDS = 50
+
+def _round_half_away(number, points):
+    """Round half away from zero, matching textstat's output rounding"""
+    p = 10 ** points
+    return float(math.floor((number * p) + math.copysign(0.5, number))) / p
+
 class SEOAnalyzer:
     """Analyze content for SEO optimization"""
     
@@ -10,14 +22,18 @@ class SEOAnalyzer:
         """
         Analyze SEO factors
         Returns score (0-100) with issues and recommendations
+        text may be a str or an AnalyzedText shared with the other analyzers
         """
         score = 100
         issues = []
         recommendations = []
         details = {}
         
+        # Tokenize once and share across helpers
+        doc = AnalyzedText.of(text)
+        text, text_lower, word_count = doc.text, doc.lower, doc.word_count
+        
         # 0. Content Metrics
-        word_count = len(text.split())
         reading_time = math.ceil(word_count / 200)  # 200 words per minute
         details['content_metrics'] = {
             'word_count': word_count,
@@ -25,6 +41,16 @@ class SEOAnalyzer:
             'character_count': len(text),
             'paragraph_count': len([p for p in text.split('\n\n') if p.strip()])
         }
+        details['word_count'] = word_count
+        
+        # Skip the expensive checks entirely for tiny inputs
+        if word_count < _MIN_WORDS:
+            return {
+                'score': 20,
+                'issues': [f"Content too short for SEO analysis ({word_count} words)"],
+                'recommendations': ["Expand content with more details, examples, and value"],
+                'details': details
+            }
         
         # Word count assessment
         if word_count < 300:
@@ -35,13 +61,20 @@ class SEOAnalyzer:
             score -= 10
             issues.append(f"Content is short ({word_count} words). Consider adding more depth")
             recommendations.append("Add more comprehensive information (aim for 1000+ words)")
+        elif word_count < 800:
+            score -= 5
+            issues.append(f"Content length moderate: {word_count} words")
+            recommendations.append("Consider expanding to 1,500-2,500 words for competitive keywords")
         elif word_count > 3000:
             issues.append(f"Very long content ({word_count} words) - ensure it stays engaging")
             recommendations.append("Consider breaking into multiple articles or adding clear navigation")
         
+        # Lowercase the keyword once for the density and header checks
+        keyword_lower = target_keyword.lower() if target_keyword else ""
+        
         # 1. Keyword Density Analysis (if target keyword provided)
         if target_keyword:
-            keyword_data = self._analyze_keyword_density(text, target_keyword)
+            keyword_data = self._analyze_keyword_density(text_lower, word_count, keyword_lower)
             details['keyword_density'] = keyword_data
             
             if keyword_data['density'] < 0.5:
@@ -74,7 +107,7 @@ class SEOAnalyzer:
         
         # 3. Header Structure Analysis
         if headers:
-            header_analysis = self._analyze_headers(headers, target_keyword)
+            header_analysis = self._analyze_headers(headers, keyword_lower)
             details['headers'] = header_analysis
             
             if not header_analysis['has_h1']:
@@ -116,19 +149,6 @@ class SEOAnalyzer:
             details['good_points'] = details.get('good_points', [])
             details['good_points'].append(f"Good meta description length: {len(meta_description)} characters")
         
-        # 5. Content Length
-        word_count = len(text.split())
-        details['word_count'] = word_count
-        
-        if word_count < 300:
-            score -= 20
-            issues.append(f"Content too short: {word_count} words")
-            recommendations.append("Expand content to at least 1,000 words for better SEO")
-        elif word_count < 800:
-            score -= 10
-            issues.append(f"Content length moderate: {word_count} words")
-            recommendations.append("Consider expanding to 1,500-2,500 words for competitive keywords")
-        
         # Ensure score doesn't go below 0
         score = max(0, score)
         
@@ -139,17 +159,13 @@ class SEOAnalyzer:
             'details': details
         }
     
-    def _analyze_keyword_density(self, text, keyword):
+    def _analyze_keyword_density(self, text_lower, total_words, keyword_lower):
         """Calculate keyword density"""
-        text_lower = text.lower()
-        keyword_lower = keyword.lower()
-        
         # Count occurrences
         count = text_lower.count(keyword_lower)
         
         # Calculate density
-        total_words = len(text.split())
-        keyword_words = len(keyword.split())
+        keyword_words = len(keyword_lower.split())
         
         # Density as percentage
         if total_words > 0:
@@ -166,15 +182,18 @@ class SEOAnalyzer:
     def _analyze_readability(self, text):
         """Analyze readability scores"""
         try:
-            flesch = textstat.flesch_reading_ease(text)
-            fk_grade = textstat.flesch_kincaid_grade(text)
+            # Both Flesch formulas are built from the same two averages - compute them once
+            sentence_length = _TEXTSTAT.avg_sentence_length(text)
+            syllables_per_word = _TEXTSTAT.avg_syllables_per_word(text)
+            flesch = _round_half_away(206.835 - 1.015 * sentence_length - 84.6 * syllables_per_word, 2)
+            fk_grade = _round_half_away(0.39 * sentence_length + 11.8 * syllables_per_word - 15.59, 1)
             
             return {
                 'flesch_reading_ease': flesch,
                 'flesch_kincaid_grade': fk_grade,
                 'reading_level': self._get_reading_level(flesch)
             }
-        except:
+        except (ZeroDivisionError, ValueError):
             return {
                 'flesch_reading_ease': 0,
                 'flesch_kincaid_grade': 0,
@@ -198,29 +217,26 @@ class SEOAnalyzer:
         else:
             return "Very Difficult (College graduate)"
     
-    def _analyze_headers(self, headers, target_keyword=""):
+    def _analyze_headers(self, headers, keyword_lower=""):
         """Analyze header structure"""
         # Safety check: ensure headers is a list
         if not isinstance(headers, list):
             headers = []
         
-        # Normalize headers to dict format if they're strings
-        normalized_headers = []
-        for h in headers:
-            if isinstance(h, dict) and 'level' in h and 'text' in h:
-                normalized_headers.append(h)
-            elif isinstance(h, str):
-                # If it's a string, skip it (shouldn't happen but be defensive)
-                continue
-        
-        has_h1 = any(h['level'] == 'h1' for h in normalized_headers)
-        has_h2 = any(h['level'] == 'h2' for h in normalized_headers)
-        has_h3 = any(h['level'] == 'h3' for h in normalized_headers)
+        # Keep only dict-format headers (skip strings or anything malformed)
+        normalized_headers = [h for h in headers if isinstance(h, dict) and 'level' in h and 'text' in h]
         
+        # Single pass: collect header levels and check for the keyword
+        levels = set()
         keyword_in_headers = False
-        if target_keyword:
-            keyword_lower = target_keyword.lower()
-            keyword_in_headers = any(keyword_lower in h['text'].lower() for h in normalized_headers)
+        for h in normalized_headers:
+            levels.add(h['level'])
+            if keyword_lower and not keyword_in_headers and keyword_lower in h['text'].lower():
+                keyword_in_headers = True
+        
+        has_h1 = 'h1' in levels
+        has_h2 = 'h2' in levels
+        has_h3 = 'h3' in levels
         
         return {
             'has_h1': has_h1,
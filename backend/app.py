@@ -1,6 +1,13 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request
 from flask_cors import CORS
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from dotenv import load_dotenv
+import atexit
+import httpx
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import sys
 import os
 
@@ -16,13 +23,59 @@ from analyzers.humanization_analyzer import HumanizationAnalyzer
 from analyzers.differentiation_analyzer import DifferentiationAnalyzer
 from utils.text_extractor import TextExtractor
 from utils.ai_improver import AIContentImprover
+from utils.text_context import AnalyzedText
 
 app = Flask(__name__)
 CORS(app)
 
+# Log through a queue so request threads never block on stdout; a background listener does the writing
+_LOG_QUEUE = queue.SimpleQueue()
+_LOG_LISTENER = QueueListener(_LOG_QUEUE, logging.StreamHandler())
+_LOG_LISTENER.start()
+atexit.register(_LOG_LISTENER.stop)
+_LOGGER = logging.getLogger('audit')
+_LOGGER.addHandler(QueueHandler(_LOG_QUEUE))
+_LOGGER.setLevel(logging.INFO)
+_LOGGER.propagate = False
+
+# Analyzers and helpers are stateless, so share one instance across requests
+_EXTRACTOR = TextExtractor()
+_SEO_ANALYZER = SEOAnalyzer()
+_SERP_ANALYZER = SERPAnalyzer()
+_AEO_ANALYZER = AEOAnalyzer()
+_HUMANIZATION_ANALYZER = HumanizationAnalyzer()
+_DIFFERENTIATION_ANALYZER = DifferentiationAnalyzer()
+_IMPROVER = AIContentImprover()
+
+# Shared HTTP client for URL mode - reuses TCP/TLS connections and negotiates HTTP/2
+_HTTP = httpx.Client(
+    http2=True,
+    timeout=10.0,
+    follow_redirects=True,
+    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'},
+    limits=httpx.Limits(max_connections=50)
+)
+atexit.register(_HTTP.close)
+
+# Analysis window: longer inputs are cut here so per-request CPU stays bounded
+_MAX_ANALYSIS_CHARS = 60000
+
+# Upper bound on how much of a page is read into memory in URL mode
+_MAX_PAGE_BYTES = 5 * 1024 * 1024
+
+# Content types URL mode will parse; anything else (PDFs, images, JSON) is rejected before download
+_HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Improvement types that can be streamed back as Server-Sent Events with "stream": true
+_STREAMED_TYPES = ('seo', 'humanize', 'readability', 'engagement')
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    return jsonify({"status": "healthy", "message": "Content Audit API is running"})
+    return _json({
+        "status": "healthy",
+        "message": "Content Audit API is running",
+        "llm_cache": _IMPROVER.cache_stats()
+    })
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze_content():
@@ -34,39 +87,31 @@ def analyze_content():
         is_url = data.get('is_url', False)
         
         if not input_data:
-            return jsonify({"error": "No input provided"}), 400
+            return _json({"error": "No input provided"}), 400
         
         # 1. Extract text and metadata
-        extractor = TextExtractor()
-        
         # If URL mode, fetch the content
         if is_url:
             try:
-                import requests
-                from bs4 import BeautifulSoup
+                from selectolax.lexbor import LexborHTMLParser
                 
-                response = requests.get(input_data, timeout=10, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
-                soup = BeautifulSoup(response.content, 'html.parser')
+                tree = LexborHTMLParser(_fetch_html(input_data), encoding=True)
                 
                 # Extract title
-                title = soup.find('title')
-                title = title.get_text() if title else ''
+                title = tree.css_first('title')
+                title = title.text() if title else ''
                 
                 # Extract meta description
-                meta_desc = soup.find('meta', attrs={'name': 'description'})
-                meta_description = meta_desc['content'] if meta_desc and meta_desc.get('content') else ''
+                meta_desc = tree.css_first('meta[name="description"]')
+                meta_description = (meta_desc.attributes.get('content') if meta_desc else None) or ''
                 
-                # Extract headers
-                headers = []
-                for tag in ['h1', 'h2', 'h3']:
-                    headers.extend([h.get_text().strip() for h in soup.find_all(tag)])
+                # Extract headers in one CSS pass; the stable sort keeps the h1s, then h2s, then h3s grouping
+                headers = [h.text().strip() for h in sorted(tree.css('h1, h2, h3'), key=lambda node: node.tag)]
                 
                 # Extract main content
-                for script in soup(['script', 'style', 'nav', 'footer', 'header']):
-                    script.decompose()
-                text = soup.get_text(separator=' ', strip=True)
+                for node in tree.css('script, style, nav, footer, header'):
+                    node.decompose()
+                text = tree.root.text(separator=' ', strip=True, skip_empty=True) if tree.root else ''
                 
                 content_data = {
                     'text': text,
@@ -76,18 +121,22 @@ def analyze_content():
                     'title': title
                 }
             except Exception as e:
-                return jsonify({"error": f"Failed to fetch URL: {str(e)}"}), 400
+                return _json({"error": f"Failed to fetch URL: {str(e)}"}), 400
         else:
-            content_data = extractor.extract(input_data)
+            content_data = _EXTRACTOR.extract(input_data)
         
         # Safety check - ensure content_data is a dictionary
         if not isinstance(content_data, dict):
-            return jsonify({"error": "Failed to extract content properly"}), 400
+            return _json({"error": "Failed to extract content properly"}), 400
             
         if not content_data.get('text'):
-            return jsonify({"error": "Could not extract text from input"}), 400
+            return _json({"error": "Could not extract text from input"}), 400
         
         text = content_data['text']
+        truncated = len(text) > _MAX_ANALYSIS_CHARS
+        if truncated:
+            text = text[:_MAX_ANALYSIS_CHARS]
+        doc = AnalyzedText(text)  # lowercase, word split and sentence split shared by every analyzer
         url = content_data.get('url')
         
         # Headers should remain in dict format [{'level': 'h1', 'text': 'Title'}]
@@ -95,64 +144,61 @@ def analyze_content():
         if not isinstance(headers, list):
             headers = []
         
-        # DEBUG: Print headers to see what we're working with
-        print(f"\n=== DEBUG HEADERS ===")
-        print(f"Type: {type(headers)}")
-        print(f"Length: {len(headers)}")
-        if headers:
-            print(f"First item type: {type(headers[0])}")
-            print(f"First item: {headers[0]}")
-        print(f"====================\n")
-            
         meta_description = content_data.get('meta_description', '')
         title = content_data.get('title', '')
         
         # 2. Run all analyzers
-        seo_analyzer = SEOAnalyzer()
-        serp_analyzer = SERPAnalyzer()
-        aeo_analyzer = AEOAnalyzer()
-        humanization_analyzer = HumanizationAnalyzer()
-        differentiation_analyzer = DifferentiationAnalyzer()
-        
-        # SEO Analysis
-        seo_results = seo_analyzer.analyze(
-            text=text,
-            headers=headers,
-            meta_description=meta_description,
-            target_keyword=target_keyword
-        )
-        
-        # SERP Performance Analysis
-        serp_results = serp_analyzer.analyze(
-            text=text,
-            target_keyword=target_keyword,
-            headers=headers
-        )
-        
-        # AEO Analysis
-        aeo_results = aeo_analyzer.analyze(
-            text=text,
-            headers=headers
-        )
-        
-        # Humanization Analysis
-        humanization_results = humanization_analyzer.analyze(text)
-        
-        # Differentiation Analysis
-        differentiation_results = differentiation_analyzer.analyze(
-            text=text,
-            serp_data=serp_results.get('details', {})
-        )
+        # SEO, SERP, AEO and Humanization are independent - run them concurrently
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            # SEO Analysis
+            seo_future = executor.submit(
+                _SEO_ANALYZER.analyze,
+                text=doc,
+                headers=headers,
+                meta_description=meta_description,
+                target_keyword=target_keyword
+            )
+            
+            # SERP Performance Analysis
+            serp_future = executor.submit(
+                _SERP_ANALYZER.analyze,
+                text=doc,
+                target_keyword=target_keyword,
+                headers=headers
+            )
+            
+            # AEO Analysis
+            aeo_future = executor.submit(
+                _AEO_ANALYZER.analyze,
+                text=doc,
+                headers=headers
+            )
+            
+            # Humanization Analysis
+            humanization_future = executor.submit(_HUMANIZATION_ANALYZER.analyze, doc)
+            
+            serp_results = serp_future.result()
+            
+            # Differentiation Analysis (depends on SERP results) - start it as soon as they are in
+            differentiation_future = executor.submit(
+                _DIFFERENTIATION_ANALYZER.analyze,
+                text=doc,
+                serp_data=serp_results.get('details', {})
+            )
+            
+            seo_results = seo_future.result()
+            aeo_results = aeo_future.result()
+            humanization_results = humanization_future.result()
+            differentiation_results = differentiation_future.result()
         
         # 3. Calculate overall score
-        scores = [
-            seo_results['score'],
-            serp_results['score'],
-            aeo_results['score'],
-            humanization_results['score'],
-            differentiation_results['score']
-        ]
-        overall_score = sum(scores) / len(scores)
+        overall_score = (
+            seo_results['score']
+            + serp_results['score']
+            + aeo_results['score']
+            + humanization_results['score']
+            + differentiation_results['score']
+        ) / 5
         
         # 4. Generate rank improvement prediction
         current_rank = serp_results['details'].get('ranking_prediction', {}).get('current_position', 20)
@@ -170,7 +216,8 @@ def analyze_content():
             'overall_score': round(overall_score, 1),
             'original_text': text[:5000],  # Store first 5000 chars for AI rewriting
             'content_info': {
-                'word_count': len(text.split()),
+                'word_count': doc.word_count,
+                'truncated': truncated,
                 'source_type': content_data.get('source_type', 'text'),
                 'url': url,
                 'title': title,
@@ -184,22 +231,17 @@ def analyze_content():
                 'differentiation': differentiation_results
             },
             'rank_prediction': rank_prediction,
-            'top_recommendations': _get_top_recommendations([
+            'top_recommendations': _get_top_recommendations((
                 seo_results, serp_results, aeo_results, 
                 humanization_results, differentiation_results
-            ])
+            ))
         }
         
-        return jsonify(response)
+        return _json(response)
         
     except Exception as e:
-        import traceback
-        error_traceback = traceback.format_exc()
-        print("="*50)
-        print("ERROR IN /api/analyze:")
-        print(error_traceback)
-        print("="*50)
-        return jsonify({"error": str(e), "traceback": error_traceback}), 500
+        _LOGGER.exception("analyze failed")
+        return _json({"error": str(e)}), 500
 
 @app.route('/api/improve', methods=['POST'])
 def improve_content():
@@ -213,16 +255,19 @@ def improve_content():
         custom_prompt = data.get('custom_prompt', None)
         
         if not text:
-            return jsonify({"error": "No text provided"}), 400
+            return _json({"error": "No text provided"}), 400
         
-        improver = AIContentImprover()
+        if data.get('stream') and improvement_type in _STREAMED_TYPES:
+            chunks = _IMPROVER.stream_rewrite(improvement_type, text, target_keyword, analysis)
+            return app.response_class(_sse(chunks), mimetype='text/event-stream',
+                                      headers={'Cache-Control': 'no-cache'})
         
         if improvement_type == 'meta':
             # Generate meta description
             title = data.get('title', '')
-            result = improver.fix_meta_description(title, text, target_keyword)
+            result = _IMPROVER.fix_meta_description(title, text, target_keyword)
             
-            return jsonify({
+            return _json({
                 'success': True,
                 'improved_meta': result,
                 'changes_made': ['Generated SEO-optimized meta description']
@@ -230,44 +275,49 @@ def improve_content():
         
         elif improvement_type == 'seo':
             # SEO-focused rewrite
-            result = improver.rewrite_for_seo(text, target_keyword, analysis)
-            return jsonify(result)
+            result = _IMPROVER.rewrite_for_seo(text, target_keyword, analysis)
+            return _json(result)
         
         elif improvement_type == 'humanize':
             # Humanization rewrite
-            result = improver.humanize_content(text)
-            return jsonify(result)
+            result = _IMPROVER.humanize_content(text, analysis)
+            return _json(result)
         
         elif improvement_type == 'readability':
             # Readability improvement
-            result = improver.improve_readability(text)
-            return jsonify(result)
+            result = _IMPROVER.improve_readability(text, analysis)
+            return _json(result)
         
         elif improvement_type == 'engagement':
             # Engagement optimization
-            result = improver.boost_engagement(text)
-            return jsonify(result)
+            result = _IMPROVER.boost_engagement(text, analysis)
+            return _json(result)
         
         elif improvement_type == 'paragraph':
+            issue_type = data.get('issue_type', 'humanization')
+            paragraphs = data.get('paragraphs')
+            if isinstance(paragraphs, list) and paragraphs:
+                # Several paragraphs - rewritten in batches rather than one model call each
+                result = _IMPROVER.rewrite_paragraphs_batch(paragraphs, issue_type)
+                return _json(result)
+            
             # Rewrite specific paragraph
             paragraph = data.get('paragraph', text[:500])
-            issue_type = data.get('issue_type', 'humanization')
-            result = improver.rewrite_paragraph(paragraph, issue_type)
+            result = _IMPROVER.rewrite_paragraph(paragraph, issue_type)
             
-            return jsonify({
+            return _json({
                 'success': True,
                 'improved_paragraph': result
             })
         
         else:
             # Full content improvement (default)
-            result = improver.generate_fixes(text, analysis)
-            return jsonify(result)
+            result = _IMPROVER.generate_fixes(text, analysis)
+            return _json(result)
             
     except Exception as e:
-        import traceback
-        print("Error in improve_content:", traceback.format_exc())
-        return jsonify({"error": str(e), "success": False}), 500
+        _LOGGER.exception("improve failed")
+        return _json({"error": str(e), "success": False}), 500
 
 @app.route('/api/subtopics', methods=['POST'])
 def suggest_subtopics():
@@ -278,34 +328,60 @@ def suggest_subtopics():
         serp_data = data.get('serp_data', {})
         
         if not keyword:
-            return jsonify({"error": "No keyword provided"}), 400
+            return _json({"error": "No keyword provided"}), 400
         
-        improver = AIContentImprover()
-        subtopics = improver.suggest_subtopics(keyword, serp_data)
+        subtopics = _IMPROVER.suggest_subtopics(keyword, serp_data)
         
-        return jsonify({
+        return _json({
             'success': True,
             'subtopics': subtopics
         })
         
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _json({"error": str(e)}), 500
+
+def _json(obj):
+    """Build a JSON response with orjson (much faster than the stdlib encoder behind jsonify)"""
+    # NumPy scalars from the analyzers serialize natively; anything else unknown falls back to str
+    return app.response_class(
+        orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY),
+        mimetype='application/json'
+    )
+
+def _sse(chunks):
+    """Frame rewrite chunks as Server-Sent Events, ending with a done (or error) event"""
+    try:
+        for chunk in chunks:
+            yield b'data: ' + orjson.dumps(chunk) + b'\n\n'
+        yield b'event: done\ndata: {}\n\n'
+    except Exception as e:
+        _LOGGER.exception("improve stream failed")
+        yield b'event: error\ndata: ' + orjson.dumps({"error": str(e)}) + b'\n\n'
+
+def _fetch_html(url):
+    """Fetch an HTML page body, reading at most _MAX_PAGE_BYTES to bound memory"""
+    with _HTTP.stream('GET', url) as response:
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in _HTML_CONTENT_TYPES:
+            raise ValueError(f"Unsupported content type: {content_type}")
+        
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > _MAX_PAGE_BYTES:
+            raise ValueError(f"Page too large ({int(content_length):,} bytes)")
+        
+        body = bytearray()
+        for chunk in response.iter_bytes(65536):
+            body.extend(chunk)
+            if len(body) >= _MAX_PAGE_BYTES:
+                break
+        return bytes(body[:_MAX_PAGE_BYTES])
 
 def _get_top_recommendations(all_results):
     """Extract top 5 recommendations across all analyzers"""
-    all_recommendations = []
-    
-    for result in all_results:
-        if 'recommendations' in result:
-            all_recommendations.extend(result['recommendations'][:2])
-    
-    # Return top 5 unique recommendations
-    unique_recs = []
-    for rec in all_recommendations:
-        if rec not in unique_recs:
-            unique_recs.append(rec)
-    
-    return unique_recs[:5]
+    # First two per analyzer, deduped in first-seen order without an intermediate list
+    return list(dict.fromkeys(
+        rec for result in all_results for rec in result.get('recommendations', ())[:2]
+    ))[:5]
 
 if __name__ == '__main__':
     print("\n" + "="*50)
@@ -0,0 +1,51 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.serp_scraper import SERPScraper
+
+_PAGE = b"<html><body><main><h1>Title</h1><p>Some competitor text here</p></main></body></html>"
+
+class _PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(_PAGE)))
+        self.end_headers()
+        self.wfile.write(_PAGE)
+    
+    def log_message(self, *args):
+        pass
+
+class FetchPagesContentTest(unittest.TestCase):
+    """A bad competitor URL yields empty content for that URL instead of failing the batch"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.good_url = f"http://127.0.0.1:{cls.server.server_port}/page"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def test_bad_urls_return_empty_content(self):
+        scraper = SERPScraper()
+        bad_urls = [
+            'https://xn--.com/',        # malformed IDNA host
+            'http://localhost:99999/',  # invalid port
+            'http://127.0.0.1:1/',      # connection refused
+            'not a url',
+        ]
+        
+        pages = scraper.fetch_pages_content([self.good_url] + bad_urls)
+        
+        self.assertEqual(len(pages), len(bad_urls) + 1)
+        self.assertEqual(pages[0]['headers'], ['Title'])
+        self.assertGreater(pages[0]['word_count'], 0)
+        for page in pages[1:]:
+            self.assertEqual(page, scraper._empty_content())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import re
+import ahocorasick
+from collections import Counter, defaultdict
+
+# Lowercase word tokens, keeping apostrophes so contractions stay whole
+_WORD_RE = re.compile(r"[a-z']+")
+
+def build_phrase_automaton(categories):
+    """
+    Build one Aho-Corasick automaton from a {category: phrases} mapping
+    Phrases shared between categories are stored once and tagged with every category
+    """
+    tags = defaultdict(list)
+    for category, phrases in categories.items():
+        for idx, phrase in enumerate(phrases):
+            tags[phrase].append((category, idx))
+    
+    automaton = ahocorasick.Automaton()
+    for phrase, phrase_tags in tags.items():
+        automaton.add_word(phrase, tuple(phrase_tags))
+    automaton.make_automaton()
+    return automaton
+
+def scan_phrases(automaton, text):
+    """
+    Single linear pass over text
+    Returns {category: Counter(phrase index -> occurrences)}
+    """
+    hits = defaultdict(Counter)
+    for _, phrase_tags in automaton.iter(text):
+        for category, idx in phrase_tags:
+            hits[category][idx] += 1
+    return hits
+
+def count_words(text_lower):
+    """Counter of whole-word tokens, for single-word indicator lookups"""
+    return Counter(_WORD_RE.findall(text_lower))
@@ -1,6 +1,64 @@
-import requests
-from bs4 import BeautifulSoup
-import re
+import asyncio
+import atexit
+import threading
+import httpx
+from selectolax.lexbor import LexborHTMLParser
+from cachetools import TTLCache
+
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Pooled HTTP/2 client for the Google results request, so repeat queries skip the TCP/TLS handshake
+# (the transport retries a failed connect once; HTTP/2 and pool limits must be set on it)
+_HTTP = httpx.Client(
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=1,
+        limits=httpx.Limits(max_connections=50)
+    ),
+    timeout=10.0,
+    follow_redirects=True,
+    headers=_HEADERS
+)
+atexit.register(_HTTP.close)
+
+# Competitor pages are fetched on one long-lived event loop, so a single pooled async client
+# and its keep-alive connections are shared by every request instead of rebuilt per call
+_LOOP = asyncio.new_event_loop()
+threading.Thread(target=_LOOP.run_forever, name='serp-fetch', daemon=True).start()
+_ASYNC_HTTP = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=1,
+        limits=httpx.Limits(max_connections=20)
+    ),
+    timeout=10.0,
+    follow_redirects=True,
+    headers=_HEADERS
+)
+atexit.register(lambda: asyncio.run_coroutine_threadsafe(_ASYNC_HTTP.aclose(), _LOOP).result(5))
+
+# Upper bound on competitor pages one request fetches at the same time
+_MAX_CONCURRENT_FETCHES = 10
+
+# Competitor bodies are streamed and cut at this size, the same cap URL mode uses
+_MAX_PAGE_BYTES = 5 * 1024 * 1024
+_READ_CHUNK_BYTES = 65536
+
+# Content types worth parsing; PDFs, images and feeds are skipped before download
+_HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Process-wide caches for repeat keywords (1 hour). Only successful fetches are stored,
+# so a failed scrape or page is retried on the next request instead of pinned for the TTL.
+_SERP_CACHE = TTLCache(maxsize=256, ttl=3600)
+_PAGE_CACHE = TTLCache(maxsize=256, ttl=3600)
+_CACHE_LOCK = threading.Lock()
+
+def _is_html(response):
+    """True when a response declares an HTML content type (or none at all)"""
+    content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    return not content_type or content_type in _HTML_CONTENT_TYPES
 
 class SERPScraper:
     """Scrape SERP results to analyze competition"""
@@ -10,45 +68,47 @@ class SERPScraper:
         Scrape top Google results for a keyword
         Returns list of URLs and their basic info
         """
+        cache_key = (keyword, num_results)
+        with _CACHE_LOCK:
+            cached = _SERP_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # For hackathon: Using a simple scraping approach
             # In production, use proper SERP API (Serper, SerpAPI, etc.)
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
             query = keyword.replace(' ', '+')
             url = f"https://www.google.com/search?q={query}&num={num_results}"
             
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = _HTTP.get(url)
+            tree = LexborHTMLParser(response.content, encoding=True)
             
             results = []
             
             # Find search result divs
-            search_results = soup.find_all('div', class_='g')
+            search_results = tree.css('div.g')
             
             for result in search_results[:num_results]:
                 try:
                     # Extract URL
-                    link_tag = result.find('a')
-                    if not link_tag or not link_tag.get('href'):
+                    link_tag = result.css_first('a')
+                    if not link_tag or not link_tag.attributes.get('href'):
                         continue
                     
-                    result_url = link_tag.get('href')
+                    result_url = link_tag.attributes.get('href')
                     
                     # Skip non-http URLs
                     if not result_url.startswith('http'):
                         continue
                     
                     # Extract title
-                    title_tag = result.find('h3')
-                    title = title_tag.get_text() if title_tag else ""
+                    title_tag = result.css_first('h3')
+                    title = title_tag.text() if title_tag else ""
                     
                     # Extract snippet
-                    snippet_tag = result.find('div', class_='VwiC3b')
-                    snippet = snippet_tag.get_text() if snippet_tag else ""
+                    snippet_tag = result.css_first('div.VwiC3b')
+                    snippet = snippet_tag.text() if snippet_tag else ""
                     
                     results.append({
                         'url': result_url,
@@ -59,6 +119,10 @@ class SERPScraper:
                 except Exception as e:
                     continue
             
+            if results:
+                with _CACHE_LOCK:
+                    _SERP_CACHE[cache_key] = results
+            
             return results
             
         except Exception as e:
@@ -66,41 +130,89 @@ class SERPScraper:
             # In real scenario, would use SERP API
             return []
     
-    def fetch_page_content(self, url):
-        """Fetch and extract content from a URL"""
+    def fetch_pages_content(self, urls):
+        """
+        Fetch and extract content from several URLs concurrently
+        Returns one content dict per URL, in the same order
+        """
+        with _CACHE_LOCK:
+            pages = {url: _PAGE_CACHE.get(url) for url in urls}
+        
+        # Only go to the network for pages that are not cached
+        missing = [url for url, content in pages.items() if content is None]
+        if missing:
+            # Download on the shared loop, parse here on the request thread
+            bodies = asyncio.run_coroutine_threadsafe(self._fetch_all(missing), _LOOP).result()
+            for url, body in zip(missing, bodies):
+                content = self._parse_content(body) if body is not None else self._empty_content()
+                self._cache_content(url, content)
+                pages[url] = content
+        
+        return [pages[url] for url in urls]
+    
+    def _cache_content(self, url, content):
+        """Remember a successfully extracted page"""
+        if content['word_count'] > 0:
+            with _CACHE_LOCK:
+                _PAGE_CACHE[url] = content
+    
+    async def _fetch_all(self, urls):
+        """Download all page bodies over the shared async client (None for a page that failed or isn't HTML)"""
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_FETCHES)
+        
+        async def fetch(url):
+            async with semaphore:
+                try:
+                    async with _ASYNC_HTTP.stream('GET', url) as response:
+                        if not _is_html(response):
+                            return None
+                        body = bytearray()
+                        async for chunk in response.aiter_bytes(_READ_CHUNK_BYTES):
+                            body.extend(chunk)
+                            if len(body) >= _MAX_PAGE_BYTES:
+                                break
+                        return bytes(body[:_MAX_PAGE_BYTES])
+                except Exception:
+                    # One failing competitor (unreachable, malformed URL, bad IDNA host...) must not sink the whole batch
+                    return None
+        
+        return await asyncio.gather(*(fetch(url) for url in urls))
+    
+    def _parse_content(self, html):
+        """Extract main text and headers from a fetched page body"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            tree = LexborHTMLParser(html, encoding=True)
             
             # Remove unwanted elements
-            for element in soup(["script", "style", "nav", "footer", "aside"]):
-                element.decompose()
+            for node in tree.css('script, style, nav, footer, aside'):
+                node.decompose()
             
             # Get main content
-            main = soup.find('main') or soup.find('article') or soup.find('body')
-            text = main.get_text(separator=' ', strip=True) if main else ""
+            main = tree.css_first('main') or tree.css_first('article') or tree.body
+            text = main.text(separator=' ', strip=True, skip_empty=True) if main else ""
             
-            # Extract headers
-            headers_list = [h.get_text().strip() for level in ['h1', 'h2', 'h3'] 
-                           for h in soup.find_all(level)]
+            # Extract headers in one pass; the stable sort keeps the h1s, then h2s, then h3s grouping
+            headers_list = [h.text().strip() for h in sorted(tree.css('h1, h2, h3'), key=lambda node: node.tag)]
             
-            # Clean text
-            text = re.sub(r'\s+', ' ', text).strip()
+            # Clean text (str.split matches exactly what \s+ did, without the regex engine)
+            words = text.split()
+            text = ' '.join(words)
             
             return {
                 'text': text,
-                'word_count': len(text.split()),
+                'word_count': len(words),
                 'headers': headers_list,
                 'header_count': len(headers_list)
             }
             
         except Exception as e:
-            return {
-                'text': '',
-                'word_count': 0,
-                'headers': [],
-                'header_count': 0
-            }
+            return self._empty_content()
+    
+    def _empty_content(self):
+        """Content dict for a page that could not be fetched or parsed"""
+        return {
+            'text': '',
+            'word_count': 0,
+            'headers': [],
+            'header_count': 0
+        }
@@ -0,0 +1,31 @@
+import re
+from functools import cached_property
+from utils.phrase_matcher import count_words
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+class AnalyzedText:
+    """
+    Per-document text preprocessing shared by every analyzer
+    Build once per request and pass it to each analyze() call in place of the raw text
+    """
+    
+    def __init__(self, text):
+        self.text = text
+        self.lower = text.lower()
+        self.word_count = len(text.split())
+    
+    @classmethod
+    def of(cls, text):
+        """Return text unchanged if it is already an AnalyzedText, otherwise wrap it"""
+        return text if isinstance(text, cls) else cls(text)
+    
+    @cached_property
+    def sentence_parts(self):
+        """Raw [.!?]+ split of the text (unstripped, unfiltered)"""
+        return _SENTENCE_SPLIT_RE.split(self.text)
+    
+    @cached_property
+    def word_counts(self):
+        """Counter of lowercase whole-word tokens"""
+        return count_words(self.lower)